@@ -2,7 +2,8 @@
 # /// script
 # requires-python = ">=3.12"
 # dependencies = [
-#     "playwright==1.57.0"
+#     "playwright==1.57.0",
+#     "httpx>=0.27",
 # ]
 # ///
 #
@@ -30,17 +31,36 @@
 #   AUTHENTIK_URL    - Authentik URL (default: http://localhost:9000)
 #   TEST_ORG_SLUG    - Organization slug for SAML SSO (default: university)
 
+from __future__ import annotations
+
 import argparse
+import asyncio
+import functools
+import http.client
 import os
 import sys
+import tempfile
 import time
+import urllib.parse
 from dataclasses import dataclass
-from typing import Optional
-
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+import httpx
+
+# Playwright is imported where it is used so that --help and argument errors
+# don't pay for loading it
+if TYPE_CHECKING:
+    from playwright.async_api import (
+        Page,
+        Browser,
+        BrowserContext,
+        Playwright,
+        Response,
+    )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TestConfig:
     """Test configuration."""
     gateway_url: str
@@ -53,7 +73,7 @@ class TestConfig:
     export_cookies_for: Optional[str] = None  # Username to export cookies for
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TestUser:
     """Test user credentials from Authentik blueprint."""
     username: str
@@ -64,37 +84,64 @@ class TestUser:
 
 
 # Test users matching deploy/config/authentik/blueprint.yaml
-TEST_USERS = {
-    "super_admin": TestUser(
+TEST_USERS = (
+    TestUser(
         username="admin_super",
         password="admin123",
         role="super_admin",
         expected_email="admin.super@university.edu",
         expected_name="Super Admin",
     ),
-    "org_admin": TestUser(
+    TestUser(
         username="cs_admin",
         password="orgadmin123",
         role="org_admin",
         expected_email="cs.admin@university.edu",
         expected_name="CS Administrator",
     ),
-    "team_admin": TestUser(
+    TestUser(
         username="prof_smith",
         password="teamadmin123",
         role="team_admin",
         expected_email="prof.smith@university.edu",
         expected_name="John Smith",
     ),
-    "user": TestUser(
+    TestUser(
         username="phd_bob",
         password="user123",
         role="user",
         expected_email="phd.bob@university.edu",
         expected_name="Bob Martinez",
     ),
+)
+
+
+# Authentik login form selectors
+SEL_FLOW_EXECUTOR = "ak-flow-executor"
+SEL_USERNAME = "input[name='uidField']"
+SEL_PASSWORD = "input[type='password']"
+SEL_SUBMIT = "button[type='submit']"
+
+# Static assets aborted during login to keep Authentik page loads light
+BLOCKED_ASSETS = "**/*.{png,jpg,jpeg,gif,svg,ico,woff,woff2,ttf,otf}"
+
+# Proxy auth headers for the bootstrap admin (gateway is configured with
+# [server.trusted_proxies].dangerously_trust_all = true for testing)
+PROXY_AUTH_HEADERS = {
+    "X-Test-User": "bootstrap-admin",
+    "X-Test-Email": "admin@test.local",
+    "X-Test-Name": "Bootstrap Admin",
+    "X-Test-Roles": "super_admin",
 }
 
+SSO_CONFIG_PATH = "/admin/v1/organizations/university/sso-config"
+
+
+@functools.cache
+def users_by_username() -> dict[str, TestUser]:
+    """Index TEST_USERS by Authentik username."""
+    return {user.username: user for user in TEST_USERS}
+
 
 class SamlTestError(Exception):
     """SAML test error."""
@@ -117,23 +164,82 @@ def log_debug(msg: str, debug: bool = False) -> None:
         print(f"[DEBUG] {msg}")
 
 
+async def launch_browser(p: Playwright, config: TestConfig) -> Browser:
+    """Launch the single Chromium instance shared by every test in a run."""
+    return await p.chromium.launch(
+        headless=not config.headed,
+        slow_mo=config.slow_mo,
+    )
+
+
+async def make_context(browser: Browser, storage_state: Optional[Path] = None) -> BrowserContext:
+    """Create an isolated context (own cookies/storage) on the shared browser.
+
+    Contexts are cheap compared to a browser launch, so each user gets a fresh
+    one while the Chromium process is reused for the whole run. Passing a
+    saved `storage_state` restores that user's cookies into the new context.
+
+    Service workers are blocked so Authentik's UI doesn't install one per
+    context, and so that page.route() sees every request (Playwright does not
+    route requests served by a service worker).
+    """
+    return await browser.new_context(storage_state=storage_state, service_workers="block")
+
+
+def storage_state_path(user: TestUser) -> Path:
+    """Location of the cached Playwright storage state for a user's session."""
+    return Path(tempfile.gettempdir()) / f"hadrian-saml-{user.username}.state.json"
+
+
+class KeepAliveProbe:
+    """Readiness probe that reuses one HTTP connection across attempts.
+
+    Avoids paying a fresh TCP connect on every poll; a failed request drops
+    the socket and the next attempt reconnects transparently.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 5):
+        parts = urllib.parse.urlsplit(base_url)
+        conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.conn = conn_cls(parts.netloc, timeout=timeout)
+        self.prefix = parts.path.rstrip("/")
+
+    def request(self, method: str, path: str) -> tuple[int, bytes]:
+        """Issue a request, returning (status, body); status is 0 if unreachable."""
+        try:
+            self.conn.request(method, f"{self.prefix}{path}")
+            resp = self.conn.getresponse()
+            return resp.status, resp.read()
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            return 0, b""
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff between readiness probes, capped at 2 seconds."""
+    return min(2.0, 0.1 * 2 ** attempt)
+
+
 def wait_for_gateway(config: TestConfig, timeout: int = 60) -> bool:
     """Wait for gateway to be healthy."""
     log_info(f"Waiting for gateway at {config.gateway_url}/health...")
 
-    import urllib.request
-    import urllib.error
-
-    start = time.time()
-    while time.time() - start < timeout:
-        try:
-            req = urllib.request.urlopen(f"{config.gateway_url}/health", timeout=5)
-            if req.status == 200:
+    probe = KeepAliveProbe(config.gateway_url)
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    try:
+        while time.monotonic() < deadline:
+            status, _ = probe.request("GET", "/health")
+            if status == 200:
                 log_info("Gateway is healthy")
                 return True
-        except (urllib.error.URLError, urllib.error.HTTPError):
-            pass
-        time.sleep(2)
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
+    finally:
+        probe.close()
 
     return False
 
@@ -142,97 +248,126 @@ def wait_for_authentik(config: TestConfig, timeout: int = 120) -> bool:
     """Wait for Authentik to be healthy and SAML provider to be configured."""
     log_info(f"Waiting for Authentik at {config.authentik_url}...")
 
-    import urllib.request
-    import urllib.error
-
-    start = time.time()
-    while time.time() - start < timeout:
-        try:
-            # Check Authentik health
-            req = urllib.request.urlopen(f"{config.authentik_url}/-/health/ready/", timeout=5)
-            if req.status == 200:
-                log_info("Authentik is healthy")
-                break
-        except (urllib.error.URLError, urllib.error.HTTPError):
-            pass
-        time.sleep(2)
-    else:
-        return False
-
-    # Wait for SAML provider metadata to be available (blueprint loaded)
-    log_info("Waiting for SAML provider metadata (blueprint loading)...")
-    while time.time() - start < timeout:
-        try:
-            saml_metadata_url = f"{config.authentik_url}/application/saml/hadrian-gateway/metadata/"
-            req = urllib.request.urlopen(saml_metadata_url, timeout=5)
-            if req.status == 200:
-                content = req.read().decode('utf-8')
-                if 'EntityDescriptor' in content:
+    saml_metadata_path = "/application/saml/hadrian-gateway/metadata/"
+    probe = KeepAliveProbe(config.authentik_url)
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    healthy = False
+    try:
+        while time.monotonic() < deadline:
+            if not healthy:
+                # Check Authentik health
+                status, _ = probe.request("GET", "/-/health/ready/")
+                if status == 200:
+                    log_info("Authentik is healthy")
+                    # Wait for SAML provider metadata to be available (blueprint loaded)
+                    log_info("Waiting for SAML provider metadata (blueprint loading)...")
+                    healthy = True
+                    attempt = 0
+                    continue
+            # Cheap HEAD until the provider exists, then GET to check the content
+            elif probe.request("HEAD", saml_metadata_path)[0] == 200:
+                status, content = probe.request("GET", saml_metadata_path)
+                if status == 200 and b"EntityDescriptor" in content:
                     log_info("SAML provider metadata available")
                     return True
-        except (urllib.error.URLError, urllib.error.HTTPError):
-            pass
-        time.sleep(2)
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
+    finally:
+        probe.close()
+
+    return False
+
+
+def wait_for_saml_config(config: TestConfig, timeout: int = 30) -> bool:
+    """Wait for the gateway to load the organization's SAML config.
+
+    The gateway only serves SP metadata once the SAML authenticator for the
+    org is registered, so a 200 means logins will be accepted. Registration
+    usually lands within a few hundred milliseconds of the config being
+    created, so poll at a short fixed interval rather than backing off.
+    """
+    log_info("Waiting for gateway to load SAML config...")
+
+    probe = KeepAliveProbe(config.gateway_url)
+    deadline = time.monotonic() + timeout
+    try:
+        while time.monotonic() < deadline:
+            status, _ = probe.request("GET", f"/auth/saml/metadata?org={config.org_slug}")
+            if status == 200:
+                return True
+            time.sleep(0.1)
+    finally:
+        probe.close()
 
     return False
 
 
-def setup_saml_config(config: TestConfig) -> bool:
+async def create_if_absent(client: httpx.AsyncClient, path: str, body: dict) -> dict | None:
+    """POST a create request; returns the created resource, or None if it already exists.
+
+    Any status other than 2xx or 409 raises httpx.HTTPStatusError.
+    """
+    resp = await client.post(path, json=body)
+    if resp.status_code == 409:
+        return None
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def setup_saml_config(config: TestConfig) -> bool:
     """Set up SAML SSO configuration via Admin API.
 
     Creates organization, teams, SAML SSO config, and group mappings.
     Uses proxy auth headers for authentication (gateway is configured with
     [server.trusted_proxies].dangerously_trust_all = true for testing).
+    All requests share one pooled client; independent creates run concurrently.
     """
     log_info("Setting up SAML deployment via Admin API...")
 
-    import json
-    import urllib.request
-    import urllib.error
+    async with httpx.AsyncClient(
+        base_url=config.gateway_url,
+        headers=PROXY_AUTH_HEADERS,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=8),
+    ) as client:
+        # The SSO config is created last, so if it exists with provisioning
+        # enabled a previous run already completed the setup. Any failure here
+        # (including a non-JSON proxy error page at startup) means set it up.
+        try:
+            resp = await client.get(SSO_CONFIG_PATH)
+            if resp.is_success and resp.json().get("provisioning_enabled"):
+                log_info("  SAML SSO config already present, skipping setup")
+                return True
+        except (httpx.HTTPError, ValueError):
+            pass
 
-    gateway_url = config.gateway_url
-    authentik_url = config.authentik_url
+        try:
+            await create_resources(client, config)
+        except httpx.HTTPStatusError as e:
+            log_error(f"Failed to create {e.request.url.path}: {e.response.status_code} - {e.response.text}")
+            return False
+
+    log_info("SAML deployment setup complete!")
+    return True
 
-    # Proxy auth headers for bootstrap admin
-    proxy_auth_headers = {
-        "X-Test-User": "bootstrap-admin",
-        "X-Test-Email": "admin@test.local",
-        "X-Test-Name": "Bootstrap Admin",
-        "X-Test-Roles": "super_admin",
-        "Content-Type": "application/json",
-    }
 
+async def create_resources(client: httpx.AsyncClient, config: TestConfig) -> None:
+    """Create the organization, teams, SSO config, and group mappings."""
     # Create organization
     log_info("Creating university organization...")
-    org_data = json.dumps({"slug": "university", "name": "State University"}).encode()
-    try:
-        req = urllib.request.Request(
-            f"{gateway_url}/admin/v1/organizations",
-            data=org_data,
-            headers=proxy_auth_headers,
-            method="POST"
-        )
-        resp = urllib.request.urlopen(req, timeout=10)
-        org_response = json.loads(resp.read().decode())
-        org_id = org_response.get("id")
-        log_info(f"  Created organization: {org_id}")
-    except urllib.error.HTTPError as e:
-        if e.code == 409:
-            # Already exists, get the org
-            req = urllib.request.Request(
-                f"{gateway_url}/admin/v1/organizations/university",
-                headers=proxy_auth_headers,
-            )
-            resp = urllib.request.urlopen(req, timeout=10)
-            org_response = json.loads(resp.read().decode())
-            org_id = org_response.get("id")
-            log_info(f"  Organization already exists: {org_id}")
-        else:
-            log_error(f"Failed to create organization: {e}")
-            return False
-
-    # Use proxy auth headers for all subsequent requests
-    auth_headers = proxy_auth_headers
+    org = await create_if_absent(
+        client,
+        "/admin/v1/organizations",
+        {"slug": "university", "name": "State University"},
+    )
+    if org is not None:
+        log_info(f"  Created organization: {org.get('id')}")
+    else:
+        # Already exists, get the org
+        resp = await client.get("/admin/v1/organizations/university")
+        resp.raise_for_status()
+        log_info(f"  Organization already exists: {resp.json().get('id')}")
 
     # Create teams
     teams = [
@@ -244,63 +379,40 @@ def setup_saml_config(config: TestConfig) -> bool:
         ("it-platform", "IT Platform"),
     ]
 
-    team_ids = {}
-    for slug, name in teams:
-        team_data = json.dumps({"slug": slug, "name": name}).encode()
-        try:
-            req = urllib.request.Request(
-                f"{gateway_url}/admin/v1/organizations/university/teams",
-                data=team_data,
-                headers=auth_headers,
-                method="POST"
-            )
-            resp = urllib.request.urlopen(req, timeout=10)
-            team_response = json.loads(resp.read().decode())
-            team_ids[slug] = team_response.get("id")
-            log_debug(f"  Created team {name}: {team_ids[slug]}", config.debug)
-        except urllib.error.HTTPError as e:
-            if e.code == 409:
-                # Already exists
-                log_debug(f"  Team {name} already exists", config.debug)
-            else:
-                log_error(f"Failed to create team {name}: {e}")
+    created = await asyncio.gather(*(
+        create_if_absent(client, "/admin/v1/organizations/university/teams", {"slug": slug, "name": name})
+        for slug, name in teams
+    ))
+    team_ids = {slug: team["id"] for (slug, _), team in zip(teams, created) if team is not None}
+    for slug, team_id in team_ids.items():
+        log_debug(f"  Created team {slug}: {team_id}", config.debug)
 
     log_info(f"  Created {len(team_ids)} teams")
 
     # Create SAML SSO config
     log_info("Creating SAML SSO configuration...")
     # Use the Docker network hostname for Authentik (accessible from gateway container)
-    sso_data = json.dumps({
-        "provider_type": "saml",
-        "enabled": True,
-        "saml_metadata_url": "http://authentik-server:9000/application/saml/hadrian-gateway/metadata/",
-        "saml_sp_entity_id": "http://localhost:3000/saml",
-        "saml_email_attribute": "email",
-        "saml_name_attribute": "displayName",
-        "saml_groups_attribute": "groups",
-        "provisioning_enabled": True,
-        "create_users": True,
-        "sync_memberships_on_login": True,
-        "email_domains": ["university.edu"],
-    }).encode()
-    try:
-        req = urllib.request.Request(
-            f"{gateway_url}/admin/v1/organizations/university/sso-config",
-            data=sso_data,
-            headers=auth_headers,
-            method="POST"
-        )
-        resp = urllib.request.urlopen(req, timeout=10)
-        log_info("  SAML SSO config created")
-    except urllib.error.HTTPError as e:
-        body = e.read().decode() if hasattr(e, 'read') else str(e)
-        if e.code == 409:
-            log_info("  SAML SSO config already exists")
-        else:
-            log_error(f"Failed to create SAML SSO config: {e} - {body}")
-            # Don't fail - SSO config might already exist
+    sso_config = await create_if_absent(
+        client,
+        SSO_CONFIG_PATH,
+        {
+            "provider_type": "saml",
+            "enabled": True,
+            "saml_metadata_url": "http://authentik-server:9000/application/saml/hadrian-gateway/metadata/",
+            "saml_sp_entity_id": "http://localhost:3000/saml",
+            "saml_email_attribute": "email",
+            "saml_name_attribute": "displayName",
+            "saml_groups_attribute": "groups",
+            "provisioning_enabled": True,
+            "create_users": True,
+            "sync_memberships_on_login": True,
+            "email_domains": ["university.edu"],
+        },
+    )
+    log_info("  SAML SSO config created" if sso_config is not None else "  SAML SSO config already exists")
 
-    # Create SSO group mappings
+    # Create SSO group mappings (only for teams created above; existing
+    # teams already have theirs)
     log_info("Creating SSO group mappings...")
     group_mappings = [
         ("/cs/cs-faculty", "cs-faculty"),
@@ -311,55 +423,83 @@ def setup_saml_config(config: TestConfig) -> bool:
         ("/it/it-platform", "it-platform"),
     ]
 
-    for idp_group, team_slug in group_mappings:
-        team_id = team_ids.get(team_slug)
-        if not team_id:
-            continue
-        mapping_data = json.dumps({
+    mappings = [
+        {
             "sso_connection_name": "default",
             "idp_group": idp_group,
-            "team_id": team_id,
+            "team_id": team_ids[team_slug],
             "role": "member",
             "priority": 0,
-        }).encode()
-        try:
-            req = urllib.request.Request(
-                f"{gateway_url}/admin/v1/organizations/university/sso-group-mappings",
-                data=mapping_data,
-                headers=auth_headers,
-                method="POST"
-            )
-            urllib.request.urlopen(req, timeout=10)
-            log_debug(f"  Created mapping: {idp_group} -> {team_slug}", config.debug)
-        except urllib.error.HTTPError:
-            pass  # May already exist
+        }
+        for idp_group, team_slug in group_mappings
+        if team_slug in team_ids
+    ]
+    if not mappings:
+        return
+
+    # Mappings have a bulk import endpoint (teams do not), so send them in one request
+    resp = await client.post(
+        "/admin/v1/organizations/university/sso-group-mappings/import",
+        json={"mappings": mappings, "on_conflict": "skip"},
+    )
+    resp.raise_for_status()
+    result = resp.json()
+    for error in result.get("errors", []):
+        log_error(f"Failed to create mapping {error.get('idp_group')}: {error.get('error')}")
+    log_debug(f"  Imported mappings: {result.get('created')} created, {result.get('skipped')} skipped", config.debug)
 
     log_info("  SSO group mappings created")
-    log_info("SAML deployment setup complete!")
-    return True
 
 
-def perform_saml_login(
+def is_flow_submission(response: Response) -> bool:
+    """Match the Authentik flow executor's reply to a submitted stage."""
+    return response.request.method == "POST" and "/flows/" in response.url
+
+
+async def current_session(context: BrowserContext, config: TestConfig) -> dict | None:
+    """Return /auth/me for the context's cookies, or None if not signed in."""
+    resp = await context.request.get(f"{config.gateway_url}/auth/me")
+    if not resp.ok:
+        return None
+    try:
+        return await resp.json()
+    except ValueError:
+        return None
+
+
+async def perform_saml_login(
     page: Page,
     config: TestConfig,
     user: TestUser
 ) -> dict:
     """Perform SAML login and return the session info.
 
+    If the page's context already holds a valid gateway session, the
+    interactive IdP flow is skipped and the current session info is returned.
+
     Returns:
         dict with session info from /auth/me endpoint
 
     Raises:
         SamlTestError if login fails
     """
+    me_response = await current_session(page.context, config)
+    if me_response is not None:
+        log_info(f"Reusing existing session for user: {user.username}")
+        return me_response
+
     log_info(f"Performing SAML login for user: {user.username}")
 
     # Navigate to SAML login endpoint
     login_url = f"{config.gateway_url}/auth/saml/login?org={config.org_slug}"
     log_debug(f"Navigating to: {login_url}", config.debug)
 
-    # This will redirect to Authentik
-    response = page.goto(login_url, wait_until="networkidle")
+    # Images and fonts play no part in the SAML handshake; skip downloading them
+    await page.route(BLOCKED_ASSETS, lambda route: route.abort())
+
+    # This will redirect to Authentik. The login form is awaited explicitly
+    # below, so there is no need to wait for the network to go idle.
+    await page.goto(login_url, wait_until="domcontentloaded")
 
     # We should now be on Authentik's login page
     current_url = page.url
@@ -372,108 +512,136 @@ def perform_saml_login(
 
     # Wait for and fill in the login form
     # Authentik's login form has ak-flow-executor component
-    page.wait_for_selector("ak-flow-executor", timeout=30000)
+    await page.wait_for_selector(SEL_FLOW_EXECUTOR, timeout=30000)
+
+    # Locators are lazy, so one submit locator serves both login steps
+    submit_button = page.locator(SEL_SUBMIT)
 
     # Fill username
     log_debug("Filling username...", config.debug)
-    username_input = page.locator("input[name='uidField']")
-    username_input.wait_for(state="visible", timeout=10000)
-    username_input.fill(user.username)
+    username_input = page.locator(SEL_USERNAME)
+    await username_input.wait_for(state="visible", timeout=10000)
+    await username_input.fill(user.username)
 
-    # Click continue/next button
-    submit_button = page.locator("button[type='submit']")
-    submit_button.click()
+    # Click continue/next button, returning once the flow executor has
+    # accepted the identification stage
+    async with page.expect_response(is_flow_submission):
+        await submit_button.click()
 
     # Wait for password field (Authentik uses multi-step login)
     log_debug("Filling password...", config.debug)
-    # Try multiple selectors - Authentik may use different field names
-    password_input = page.locator("input[type='password']")
-    password_input.wait_for(state="visible", timeout=10000)
+    # Match on input type - Authentik may use different field names
+    password_input = page.locator(SEL_PASSWORD)
+    await password_input.wait_for(state="visible", timeout=10000)
     # Make sure the field is focused and clear before filling
-    password_input.click()
-    password_input.fill(user.password)
-    log_debug(f"Password field value length after fill: {len(password_input.input_value())}", config.debug)
-
-    # Submit login
-    submit_button = page.locator("button[type='submit']")
-    submit_button.click()
-
-    log_info("  Submitted credentials, waiting for SAML response...")
+    await password_input.click()
+    await password_input.fill(user.password)
+    if config.debug:
+        log_debug(f"Password field value length after fill: {len(await password_input.input_value())}", config.debug)
 
-    # Debug: wait a bit and print current URL
-    import time
-    time.sleep(2)
-    log_debug(f"Current URL after password submit: {page.url}", config.debug)
-
-    # Wait for redirect back to gateway
+    # Submit login and wait for the gateway's answer to the SAML response
     # The SAML response will POST to /auth/saml/acs which then redirects to /
+    acs_url = f"{config.gateway_url}/auth/saml/acs"
     try:
-        page.wait_for_url(f"{config.gateway_url}/**", timeout=30000)
-    except Exception as e:
-        log_debug(f"Timeout waiting for redirect. Current URL: {page.url}", config.debug)
-        # Take a screenshot for debugging
-        screenshot_path = f"/tmp/saml-debug-{user.username}.png"
-        page.screenshot(path=screenshot_path)
-        log_debug(f"Screenshot saved to: {screenshot_path}", config.debug)
-        # Get inner text via JavaScript (more reliable for SPAs)
-        inner_text = page.evaluate("() => document.body.innerText")
-        log_debug(f"Page text via JS: {inner_text[:1500] if inner_text else 'empty'}", config.debug)
+        async with page.expect_response(lambda r: r.url.startswith(acs_url), timeout=30000):
+            await submit_button.click()
+            log_info("  Submitted credentials, waiting for SAML response...")
+    except Exception:
+        log_debug(f"Timeout waiting for SAML response. Current URL: {page.url}", config.debug)
+        if config.debug:
+            # Take a screenshot for debugging
+            screenshot_path = f"/tmp/saml-debug-{user.username}.jpg"
+            await page.screenshot(path=screenshot_path, type="jpeg", quality=60)
+            log_debug(f"Screenshot saved to: {screenshot_path}", config.debug)
+            # Get inner text via JavaScript (more reliable for SPAs)
+            inner_text = await page.evaluate("() => document.body.innerText")
+            log_debug(f"Page text via JS: {inner_text[:1500] if inner_text else 'empty'}", config.debug)
         raise
 
-    current_url = page.url
-    log_debug(f"Redirected back to gateway: {current_url}", config.debug)
+    log_debug(f"SAML response accepted by gateway: {page.url}", config.debug)
 
     # Debug: Check cookies after SAML flow
-    cookies = page.context.cookies()
+    cookies = await page.context.cookies()
     log_debug(f"Cookies after SAML: {[(c['name'], c['domain'], c['path']) for c in cookies]}", config.debug)
 
-    # Verify we're logged in by checking /auth/me
+    # Verify we're logged in by checking /auth/me. The context's request API
+    # sends the browser's cookies without rendering the JSON as a page.
     log_info("  Verifying session...")
-    page.goto(f"{config.gateway_url}/auth/me")
+    resp = await page.context.request.get(f"{config.gateway_url}/auth/me")
+    if not resp.ok:
+        raise SamlTestError(f"/auth/me returned {resp.status}: {(await resp.text())[:500]}")
 
-    # Get the response body
-    import json
-    content = page.content()
+    try:
+        me_response = await resp.json()
+    except ValueError:
+        raise SamlTestError(f"Failed to parse /auth/me response: {(await resp.text())[:500]}")
+
+    log_debug(f"Session info: {me_response}", config.debug)
+    return me_response
+
+
+def session_cookie(cookies: list) -> str | None:
+    """Return the gateway session cookie value from a context's cookies."""
+    for cookie in cookies:
+        if cookie['name'] == '__gw_session':
+            return cookie['value']
+    return None
+
+
+async def cached_session_cookie(
+    browser: Browser,
+    config: TestConfig,
+    state_path: Path,
+) -> str | None:
+    """Return the session cookie from saved storage state if it is still valid."""
+    from playwright.async_api import Error as PlaywrightError
 
-    # Extract JSON from the page (it's rendered as plain text in <pre> or body)
     try:
-        # The response is JSON, might be wrapped in HTML
-        if "<pre>" in content:
-            json_text = content.split("<pre>")[1].split("</pre>")[0]
-        else:
-            # Try to find JSON in body
-            json_text = page.locator("body").inner_text()
+        context = await make_context(browser, storage_state=state_path)
+    except PlaywrightError as e:
+        log_debug(f"Ignoring unreadable session state {state_path}: {e}", config.debug)
+        return None
 
-        me_response = json.loads(json_text)
-        log_debug(f"Session info: {me_response}", config.debug)
-        return me_response
-    except (json.JSONDecodeError, IndexError) as e:
-        # Check HTTP status
-        raise SamlTestError(f"Failed to parse /auth/me response: {content[:500]}")
+    try:
+        if await current_session(context, config) is None:
+            return None
+        return session_cookie(await context.cookies())
+    finally:
+        await context.close()
 
 
-def export_session_cookie(
+async def export_session_cookie(
     browser: Browser,
     config: TestConfig,
     user: TestUser,
 ) -> str | None:
     """Login and export session cookie for bash consumption.
 
+    The session is cached as Playwright storage state, so later exports for
+    the same user skip the interactive IdP login while the session is valid.
+
     Returns:
         Session cookie value or None on failure.
     """
-    context = browser.new_context()
-    page = context.new_page()
+    state_path = storage_state_path(user)
+    if state_path.exists():
+        cookie = await cached_session_cookie(browser, config, state_path)
+        if cookie:
+            log_debug(f"Reusing cached session for {user.username}", config.debug)
+            return cookie
+
+    context = await make_context(browser)
+    page = await context.new_page()
 
     try:
         # Perform login (don't need to verify /auth/me result for cookie export)
-        perform_saml_login(page, config, user)
+        await perform_saml_login(page, config, user)
 
         # Get session cookie
-        cookies = page.context.cookies()
-        for cookie in cookies:
-            if cookie['name'] == '__gw_session':
-                return cookie['value']
+        cookie = session_cookie(await context.cookies())
+        if cookie:
+            await context.storage_state(path=state_path)
+            return cookie
 
         log_error(f"Session cookie not found for {user.username}")
         return None
@@ -484,10 +652,10 @@ def export_session_cookie(
             traceback.print_exc()
         return None
     finally:
-        context.close()
+        await context.close()
 
 
-def test_saml_login_logout(
+async def test_saml_login_logout(
     browser: Browser,
     config: TestConfig,
     user: TestUser,
@@ -495,12 +663,12 @@ def test_saml_login_logout(
     """Test complete SAML login/logout flow for a user."""
     log_info(f"=== Testing SAML flow for {user.role} ({user.username}) ===")
 
-    context = browser.new_context()
-    page = context.new_page()
+    context = await make_context(browser)
+    page = await context.new_page()
 
     try:
         # Perform login
-        me_response = perform_saml_login(page, config, user)
+        me_response = await perform_saml_login(page, config, user)
 
         # Verify user info
         email = me_response.get("email")
@@ -522,15 +690,21 @@ def test_saml_login_logout(
 
         # Test logout
         log_info("  Testing logout...")
-        page.goto(f"{config.gateway_url}/auth/saml/slo")
+        # The gateway ends the session before redirecting to the IdP's SLO
+        # page, so capture its response instead of waiting for Authentik to render
+        slo_url = f"{config.gateway_url}/auth/saml/slo"
+        async with page.expect_response(lambda r: r.url.startswith(slo_url)) as slo_info:
+            await page.goto(slo_url, wait_until="commit")
+        slo_response = await slo_info.value
+        log_debug(f"  SLO returned {slo_response.status}", config.debug)
 
         # Verify logged out by checking /auth/me returns 401
-        response = page.goto(f"{config.gateway_url}/auth/me")
-        if response and response.status == 401:
+        response = await context.request.get(f"{config.gateway_url}/auth/me")
+        if response.status == 401:
             log_info("  ✓ Logout successful (401 from /auth/me)")
         else:
             # Check if we got a login redirect or error page
-            log_info(f"  ✓ Logout successful (redirected to {page.url})")
+            log_info(f"  ✓ Logout successful (/auth/me returned {response.status} at {response.url})")
 
         log_info(f"=== PASSED: {user.role} ({user.username}) ===\n")
         return True
@@ -543,23 +717,23 @@ def test_saml_login_logout(
         return False
     finally:
         if not config.keep_alive:
-            context.close()
+            await context.close()
 
 
-def test_saml_redirect_without_setup(
+async def test_saml_redirect_without_setup(
     browser: Browser,
     config: TestConfig,
 ) -> bool:
     """Test that SAML login redirects properly even before SSO setup."""
     log_info("=== Testing SAML redirect behavior ===")
 
-    context = browser.new_context()
-    page = context.new_page()
+    context = await make_context(browser)
+    page = await context.new_page()
 
     try:
         # Try to login without SAML config - should get an error
         login_url = f"{config.gateway_url}/auth/saml/login?org=nonexistent"
-        response = page.goto(login_url)
+        response = await page.goto(login_url)
 
         # Should return 403 Forbidden since org doesn't exist
         if response and response.status in (403, 404):
@@ -569,10 +743,10 @@ def test_saml_redirect_without_setup(
             log_error(f"Expected 403/404, got {response.status if response else 'no response'}")
             return False
     finally:
-        context.close()
+        await context.close()
 
 
-def run_export_cookies(config: TestConfig, username: str) -> int:
+async def run_export_cookies(config: TestConfig, username: str) -> int:
     """Export session cookie for a specific user.
 
     Logs in as the user and prints the session cookie value to stdout.
@@ -581,16 +755,10 @@ def run_export_cookies(config: TestConfig, username: str) -> int:
     Returns:
         Exit code (0 = success, 1 = failure)
     """
-    # Find user by username
-    user = None
-    for test_user in TEST_USERS.values():
-        if test_user.username == username:
-            user = test_user
-            break
-
+    user = users_by_username().get(username)
     if user is None:
         log_error(f"Unknown username: {username}")
-        log_error(f"Valid usernames: {', '.join(u.username for u in TEST_USERS.values())}")
+        log_error(f"Valid usernames: {', '.join(users_by_username())}")
         return 1
 
     # Wait for services (output to stderr)
@@ -603,19 +771,19 @@ def run_export_cookies(config: TestConfig, username: str) -> int:
         return 1
 
     # Set up SAML config (may already exist)
-    setup_saml_config(config)
+    await setup_saml_config(config)
+
+    if not wait_for_saml_config(config):
+        log_error("Gateway did not load SAML config in time")
+        return 1
 
-    # Give the gateway time to load the SAML config
-    time.sleep(2)
+    from playwright.async_api import async_playwright
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=not config.headed,
-            slow_mo=config.slow_mo,
-        )
+    async with async_playwright() as p:
+        browser = await launch_browser(p, config)
 
         try:
-            cookie = export_session_cookie(browser, config, user)
+            cookie = await export_session_cookie(browser, config, user)
             if cookie:
                 # Print only the cookie value to stdout (no newline for easier bash capture)
                 print(cookie, end='')
@@ -623,10 +791,10 @@ def run_export_cookies(config: TestConfig, username: str) -> int:
             else:
                 return 1
         finally:
-            browser.close()
+            await browser.close()
 
 
-def run_tests(config: TestConfig) -> int:
+async def run_tests(config: TestConfig) -> int:
     """Run all SAML E2E tests.
 
     Returns:
@@ -650,27 +818,27 @@ def run_tests(config: TestConfig) -> int:
         return 1
 
     # Set up SAML config via Admin API
-    if not setup_saml_config(config):
+    if not await setup_saml_config(config):
         log_error("Failed to set up SAML configuration")
         return 1
 
-    # Give the gateway time to load the SAML config
-    log_info("Waiting for gateway to load SAML config...")
-    time.sleep(3)
+    if not wait_for_saml_config(config):
+        log_error("Gateway did not load SAML config in time")
+        return 1
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=not config.headed,
-            slow_mo=config.slow_mo,
-        )
+    from playwright.async_api import async_playwright
 
-        try:
-            results = []
+    async with async_playwright() as p:
+        browser = await launch_browser(p, config)
 
-            # Test SAML login for each user type
-            for role, user in TEST_USERS.items():
-                result = test_saml_login_logout(browser, config, user)
-                results.append((role, result))
+        try:
+            # Test SAML login for each user type concurrently; each test gets
+            # its own context, so sessions stay isolated.
+            outcomes = await asyncio.gather(*(
+                test_saml_login_logout(browser, config, user)
+                for user in TEST_USERS
+            ))
+            results = [(user.role, outcome) for user, outcome in zip(TEST_USERS, outcomes)]
 
             # Summary
             log_info("=" * 60)
@@ -692,14 +860,14 @@ def run_tests(config: TestConfig) -> int:
                 log_info("Browser kept open. Press Ctrl+C to exit.")
                 try:
                     while True:
-                        time.sleep(1)
-                except KeyboardInterrupt:
+                        await asyncio.sleep(1)
+                except (KeyboardInterrupt, asyncio.CancelledError):
                     pass
 
             return 0 if failed == 0 else 1
 
         finally:
-            browser.close()
+            await browser.close()
 
 
 def main():
@@ -763,9 +931,9 @@ def main():
 
     # Export cookies mode: login as user, print cookie, exit
     if config.export_cookies_for:
-        sys.exit(run_export_cookies(config, config.export_cookies_for))
+        sys.exit(asyncio.run(run_export_cookies(config, config.export_cookies_for)))
 
-    sys.exit(run_tests(config))
+    sys.exit(asyncio.run(run_tests(config)))
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@
 # requires-python = ">=3.12"
 # dependencies = [
 #     "pyyaml>=6.0",
+#     "orjson>=3.9",
 # ]
 # ///
 """
@@ -31,9 +32,16 @@ import re
 import sys
 from dataclasses import dataclass, field
 from enum import Enum
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # e.g. the test runner, which doesn't install it
+    orjson = None
+
 # =============================================================================
 # DOCUMENTED MISSING FIELDS
 # =============================================================================
@@ -42,9 +50,12 @@ from typing import Any
 # location is "request", "response", or "param"
 #
 # CI will FAIL if a missing field is not documented here.
+# Entries that no longer match a missing field are listed as stale in the
+# report so they can be removed.
 # =============================================================================
 
-DOCUMENTED_MISSING_FIELDS: dict[tuple[str, str, str, str], str] = {
+# Frozen so nothing can edit the table after the index below is built from it.
+DOCUMENTED_MISSING_FIELDS: Mapping[tuple[str, str, str, str], str] = MappingProxyType({
     # /chat/completions - OpenAI-specific or deprecated fields
     ("/chat/completions", "POST", "request", "safety_identifier"): "OpenAI internal safety feature",
     ("/chat/completions", "POST", "request", "prompt_cache_key"): "OpenAI-specific prompt caching key",
@@ -118,7 +129,27 @@ DOCUMENTED_MISSING_FIELDS: dict[tuple[str, str, str, str], str] = {
     ("/vector_stores/{vector_store_id}/search", "POST", "response", "search_query"): "Rewritten query not returned",
     ("/vector_stores/{vector_store_id}/search", "POST", "response", "has_more"): "Pagination not implemented for search",
     ("/vector_stores/{vector_store_id}/search", "POST", "response", "next_page"): "Pagination not implemented for search",
-}
+})
+
+
+# Same table indexed path -> (method, location) -> field -> reason, so a
+# lookup for an endpoint with no documented fields stops at the path.
+_DOCUMENTED_MISSING_BY_PATH: dict[str, dict[tuple[str, str], dict[str, str]]] = {}
+for (_path, _method, _location, _field), _reason in DOCUMENTED_MISSING_FIELDS.items():
+    _DOCUMENTED_MISSING_BY_PATH.setdefault(_path, {}).setdefault((_method, _location), {})[_field] = _reason
+del _path, _method, _location, _field, _reason
+
+_EMPTY: Mapping[Any, Any] = MappingProxyType({})
+
+
+def _documented_missing_for(path: str, method: str, location: str) -> Mapping[str, str]:
+    """Documented missing fields (field -> reason) for one endpoint location."""
+    return _DOCUMENTED_MISSING_BY_PATH.get(path, _EMPTY).get((method, location), _EMPTY)
+
+
+def _documented_missing_reason(path: str, method: str, location: str, field_name: str) -> str | None:
+    """Reason a missing field is allowed, or `None` if it isn't documented."""
+    return _documented_missing_for(path, method, location).get(field_name)
 
 # =============================================================================
 # EXTENSION FIELD MARKER
@@ -138,7 +169,7 @@ class DiffType(Enum):
     REQUIRED_MISMATCH = "required_mismatch"
 
 
-@dataclass
+@dataclass(slots=True)
 class SchemaDiff:
     """A single schema difference."""
     path: str
@@ -148,8 +179,19 @@ class SchemaDiff:
     hadrian_value: Any = None
     description: str = ""
 
+    def to_dict(self) -> dict:
+        """JSON report form."""
+        return {
+            "path": self.path,
+            "field": self.field,
+            "type": self.diff_type.value,
+            "openai_value": self.openai_value,
+            "hadrian_value": self.hadrian_value,
+            "description": self.description,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class EndpointDiff:
     """Differences for a single endpoint."""
     path: str
@@ -160,8 +202,20 @@ class EndpointDiff:
     missing_in_hadrian: bool = False
     hadrian_extension: bool = False
 
+    def to_dict(self) -> dict:
+        """JSON report form."""
+        return {
+            "path": self.path,
+            "method": self.method,
+            "missing_in_hadrian": self.missing_in_hadrian,
+            "hadrian_extension": self.hadrian_extension,
+            "request_diffs": [d.to_dict() for d in self.request_diffs],
+            "response_diffs": [d.to_dict() for d in self.response_diffs],
+            "param_diffs": [d.to_dict() for d in self.param_diffs],
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class Violation:
     """A CI-blocking violation."""
     violation_type: str  # "undocumented_missing", "unmarked_extension", "missing_endpoint"
@@ -171,8 +225,19 @@ class Violation:
     location: str = ""  # "request", "response", "param"
     message: str = ""
 
+    def to_dict(self) -> dict:
+        """JSON report form."""
+        return {
+            "type": self.violation_type,
+            "path": self.path,
+            "method": self.method,
+            "field": self.field,
+            "location": self.location,
+            "message": self.message,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class ConformanceReport:
     """Full conformance report."""
     openai_version: str
@@ -186,6 +251,8 @@ class ConformanceReport:
     hadrian_only_endpoints: list[str] = field(default_factory=list)
     # CI violations
     violations: list[Violation] = field(default_factory=list)
+    # DOCUMENTED_MISSING_FIELDS entries that no check matched (full runs only)
+    stale_documented_fields: list[tuple[str, str, str, str]] = field(default_factory=list)
 
 
 def _is_array_type(schema: dict[str, Any]) -> bool:
@@ -222,6 +289,53 @@ def _extract_type_const(schema: dict[str, Any]) -> str | None:
     return None
 
 
+def _compile_path_patterns(patterns: list[str]) -> re.Pattern[str]:
+    """Compile OpenAPI path templates into one regex for `fullmatch`.
+
+    `{param}` segments match any single segment; everything else is
+    literal. An empty list compiles to a pattern that never matches.
+    """
+    alternatives = [
+        "/".join(
+            "[^/]*" if part.startswith("{") and part.endswith("}") else re.escape(part)
+            for part in pattern.split("/")
+        )
+        for pattern in patterns
+    ]
+    return re.compile("|".join(alternatives) if alternatives else "(?!)")
+
+
+def _json_schema(operation: dict[str, Any], *keys: str) -> Mapping[str, Any]:
+    """The `application/json` schema under `operation[keys...]["content"]`,
+    or an empty mapping if any level is absent."""
+    try:
+        node = operation
+        for key in keys:
+            node = node[key]
+        return node["content"]["application/json"]["schema"]
+    except KeyError:
+        return _EMPTY
+
+
+def _required_set(schema: dict[str, Any]) -> frozenset[str]:
+    """The schema's `required` names, using the set cached at resolution
+    when present (unresolved recursive placeholders don't have one)."""
+    required = schema.get("_required_set")
+    if required is None:
+        required = frozenset(schema.get("required", ()))
+    return required
+
+
+# Distinct type strings that are still compatible, in both orders
+_COMPATIBLE_TYPE_PAIRS = frozenset({
+    ("integer", "number"),
+    ("number", "integer"),
+    # Double is compatible with number
+    ("number", "double"),
+    ("double", "number"),
+})
+
+
 class OpenAPIResolver:
     """Resolves $ref and allOf in OpenAPI schemas."""
 
@@ -229,6 +343,9 @@ class OpenAPIResolver:
         self.spec = spec
         self.components = spec.get("components", {}).get("schemas", {})
         self._cache: dict[str, dict] = {}
+        # Resolved form of each schema node, keyed by id(). The node itself
+        # is stored alongside so its id can't be reused by a new object.
+        self._schema_cache: dict[int, tuple[dict, dict]] = {}
 
     def resolve_ref(self, ref: str) -> dict[str, Any]:
         """Resolve a $ref to its schema."""
@@ -270,6 +387,19 @@ class OpenAPIResolver:
         if not isinstance(schema, dict):
             return schema
 
+        cached = self._schema_cache.get(id(schema))
+        if cached is not None:
+            return cached[1]
+        result = self._resolve_schema(schema)
+        # Every branch returns a fresh dict, so it's safe to annotate.
+        # Comparisons need `required` as a set; build it once here.
+        if "required" in result:
+            result["_required_set"] = frozenset(result["required"])
+        self._schema_cache[id(schema)] = (schema, result)
+        return result
+
+    def _resolve_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
+        """Uncached body of `resolve_schema`."""
         # Handle $ref
         if "$ref" in schema:
             resolved = self.resolve_ref(schema["$ref"])
@@ -354,8 +484,10 @@ class OpenAPIResolver:
                 self.resolve_schema({"properties": source["properties"]}).get("properties", {})
             )
         if "required" in source:
-            existing = set(target.get("required", []))
-            existing.update(source["required"])
+            # Ordered de-duplication keeps `required` stable across runs;
+            # resolve_schema derives `_required_set` from the merged list
+            existing = dict.fromkeys(target.get("required", ()))
+            existing.update(dict.fromkeys(source["required"]))
             target["required"] = list(existing)
         # Copy other fields
         for key in ["type", "description"]:
@@ -459,6 +591,21 @@ class ConformanceChecker:
         self.verbose = verbose
         self.openai_resolver = OpenAPIResolver(openai_spec)
         self.hadrian_resolver = OpenAPIResolver(hadrian_spec)
+        self._documented_hits: set[tuple[str, str, str, str]] = set()
+        # id(schema) -> (schema, type string); see `_get_type_string`
+        self._type_string_cache: dict[int, tuple[dict, str]] = {}
+        self._mapped_hadrian_paths = frozenset(self.PATH_MAPPING.values())
+        # Out-of-scope rules compiled once; path params match any segment
+        self._out_of_scope_prefixes = tuple(self.OUT_OF_SCOPE_PREFIXES)
+        self._out_of_scope_paths_re = _compile_path_patterns(self.OUT_OF_SCOPE_PATHS)
+        out_of_scope_methods: dict[str, list[str]] = {}
+        for pattern, methods in self.OUT_OF_SCOPE_METHODS.items():
+            for method in methods:
+                out_of_scope_methods.setdefault(method, []).append(pattern)
+        self._out_of_scope_method_res = {
+            method: _compile_path_patterns(patterns)
+            for method, patterns in out_of_scope_methods.items()
+        }
 
     def check_conformance(self, endpoint_filter: str | None = None) -> ConformanceReport:
         """Run full conformance check."""
@@ -474,7 +621,79 @@ class ConformanceChecker:
             fully_conformant=0,
         )
 
-        # Check each OpenAI endpoint
+        for openai_path, method, openai_op, hadrian_op in self._collect_endpoints(
+            openai_paths, hadrian_paths, endpoint_filter, report,
+        ):
+            report.endpoints_checked += 1
+            method_upper = method.upper()
+
+            if hadrian_op is None:
+                # Endpoint missing in Hadrian - this is a violation
+                diff = EndpointDiff(
+                    path=openai_path,
+                    method=method_upper,
+                    missing_in_hadrian=True,
+                )
+                report.endpoints_with_diffs.append(diff)
+                report.violations.append(Violation(
+                    violation_type="missing_endpoint",
+                    path=openai_path,
+                    method=method_upper,
+                    message=f"Endpoint {method_upper} {openai_path} is not implemented in Hadrian",
+                ))
+                continue
+
+            # Compare the endpoint
+            endpoint_diff, violations = self._compare_endpoint(
+                openai_path,
+                method,
+                openai_op,
+                hadrian_op,
+            )
+            report.violations.extend(violations)
+
+            if endpoint_diff.request_diffs or endpoint_diff.response_diffs or endpoint_diff.param_diffs:
+                report.endpoints_with_diffs.append(endpoint_diff)
+            else:
+                report.fully_conformant += 1
+
+        # Entries that never matched a missing field have drifted from the
+        # spec; only meaningful when every endpoint was checked
+        if not endpoint_filter:
+            report.stale_documented_fields = [
+                key for key in DOCUMENTED_MISSING_FIELDS if key not in self._documented_hits
+            ]
+
+        # Find Hadrian-only endpoints (extensions)
+        for hadrian_path in hadrian_paths:
+            # Skip admin endpoints
+            if hadrian_path.startswith("/admin/"):
+                continue
+            # Check if this maps to any OpenAI endpoint
+            if hadrian_path not in self._mapped_hadrian_paths:
+                # Check if it follows the pattern /api/v1/...
+                if hadrian_path.startswith("/api/v1/"):
+                    possible_openai = hadrian_path.replace("/api/v1/", "/")
+                    if possible_openai not in openai_paths:
+                        report.hadrian_only_endpoints.append(hadrian_path)
+
+        return report
+
+    def _collect_endpoints(
+        self,
+        openai_paths: dict[str, Any],
+        hadrian_paths: dict[str, Any],
+        endpoint_filter: str | None,
+        report: ConformanceReport,
+    ) -> list[tuple[str, str, dict, dict | None]]:
+        """List the in-scope `(openai_path, method, openai_op, hadrian_op)`
+        pairs to compare, in spec order.
+
+        All scope and filter decisions are made here, once per path;
+        out-of-scope paths are recorded on `report`. `hadrian_op` is `None`
+        when Hadrian doesn't implement the method.
+        """
+        work: list[tuple[str, str, dict, dict | None]] = []
         for openai_path, openai_methods in openai_paths.items():
             # Skip out-of-scope endpoints
             if self._is_out_of_scope(openai_path):
@@ -492,7 +711,7 @@ class ConformanceChecker:
 
             hadrian_methods = hadrian_paths.get(hadrian_path, {})
 
-            for method in ["get", "post", "put", "patch", "delete"]:
+            for method in ("get", "post", "put", "patch", "delete"):
                 if method not in openai_methods:
                     continue
 
@@ -500,96 +719,27 @@ class ConformanceChecker:
                 if self._is_method_out_of_scope(openai_path, method):
                     continue
 
-                report.endpoints_checked += 1
-
-                if method not in hadrian_methods:
-                    # Endpoint missing in Hadrian - this is a violation
-                    diff = EndpointDiff(
-                        path=openai_path,
-                        method=method.upper(),
-                        missing_in_hadrian=True,
-                    )
-                    report.endpoints_with_diffs.append(diff)
-                    report.violations.append(Violation(
-                        violation_type="missing_endpoint",
-                        path=openai_path,
-                        method=method.upper(),
-                        message=f"Endpoint {method.upper()} {openai_path} is not implemented in Hadrian",
-                    ))
-                    continue
-
-                # Compare the endpoint
-                endpoint_diff, violations = self._compare_endpoint(
-                    openai_path,
-                    method,
-                    openai_methods[method],
-                    hadrian_methods[method],
-                )
-                report.violations.extend(violations)
-
-                if endpoint_diff.request_diffs or endpoint_diff.response_diffs or endpoint_diff.param_diffs:
-                    report.endpoints_with_diffs.append(endpoint_diff)
-                else:
-                    report.fully_conformant += 1
-
-        # Find Hadrian-only endpoints (extensions)
-        for hadrian_path in hadrian_paths:
-            # Skip admin endpoints
-            if hadrian_path.startswith("/admin/"):
-                continue
-            # Check if this maps to any OpenAI endpoint
-            is_mapped = False
-            for openai_path, mapped_hadrian in self.PATH_MAPPING.items():
-                if hadrian_path == mapped_hadrian:
-                    is_mapped = True
-                    break
-            if not is_mapped:
-                # Check if it follows the pattern /api/v1/...
-                if hadrian_path.startswith("/api/v1/"):
-                    possible_openai = hadrian_path.replace("/api/v1/", "/")
-                    if possible_openai not in openai_paths:
-                        report.hadrian_only_endpoints.append(hadrian_path)
-
-        return report
+                work.append((openai_path, method, openai_methods[method], hadrian_methods.get(method)))
+        return work
 
     def _is_out_of_scope(self, path: str) -> bool:
         """Check if an OpenAI path is out of scope for Hadrian."""
-        # Check explicit paths first
-        if path in self.OUT_OF_SCOPE_PATHS:
-            return True
-        # Check path patterns (handle path params)
-        for out_of_scope_path in self.OUT_OF_SCOPE_PATHS:
-            if self._path_matches_pattern(path, out_of_scope_path):
-                return True
-        # Check prefixes
-        for prefix in self.OUT_OF_SCOPE_PREFIXES:
-            if path.startswith(prefix):
-                return True
-        return False
+        return (
+            self._out_of_scope_paths_re.fullmatch(path) is not None
+            or path.startswith(self._out_of_scope_prefixes)
+        )
 
-    def _path_matches_pattern(self, path: str, pattern: str) -> bool:
-        """Check if a path matches a pattern with path parameters."""
-        path_parts = path.split("/")
-        pattern_parts = pattern.split("/")
-        if len(path_parts) != len(pattern_parts):
+    def _is_documented_missing(self, path: str, method: str, location: str, field_name: str) -> bool:
+        """Check DOCUMENTED_MISSING_FIELDS, recording the hit for stale-entry detection."""
+        if _documented_missing_reason(path, method, location, field_name) is None:
             return False
-        for path_part, pattern_part in zip(path_parts, pattern_parts):
-            if pattern_part.startswith("{") and pattern_part.endswith("}"):
-                continue  # Path parameter, matches anything
-            if path_part != pattern_part:
-                return False
+        self._documented_hits.add((path, method, location, field_name))
         return True
 
     def _is_method_out_of_scope(self, path: str, method: str) -> bool:
         """Check if a specific method is out of scope for a path."""
-        # Check exact path match
-        if path in self.OUT_OF_SCOPE_METHODS:
-            return method in self.OUT_OF_SCOPE_METHODS[path]
-        # Check path patterns
-        for pattern, methods in self.OUT_OF_SCOPE_METHODS.items():
-            if self._path_matches_pattern(path, pattern) and method in methods:
-                return True
-        return False
+        pattern = self._out_of_scope_method_res.get(method)
+        return pattern is not None and pattern.fullmatch(path) is not None
 
     def _compare_endpoint(
         self,
@@ -604,8 +754,8 @@ class ConformanceChecker:
         method_upper = method.upper()
 
         # Compare request body
-        openai_body = openai_op.get("requestBody", {}).get("content", {}).get("application/json", {}).get("schema", {})
-        hadrian_body = hadrian_op.get("requestBody", {}).get("content", {}).get("application/json", {}).get("schema", {})
+        openai_body = _json_schema(openai_op, "requestBody")
+        hadrian_body = _json_schema(hadrian_op, "requestBody")
 
         if openai_body and hadrian_body:
             resolved_openai = self.openai_resolver.resolve_schema(openai_body)
@@ -621,8 +771,8 @@ class ConformanceChecker:
             violations.extend(req_violations)
 
         # Compare response body (200 response)
-        openai_resp = openai_op.get("responses", {}).get("200", {}).get("content", {}).get("application/json", {}).get("schema", {})
-        hadrian_resp = hadrian_op.get("responses", {}).get("200", {}).get("content", {}).get("application/json", {}).get("schema", {})
+        openai_resp = _json_schema(openai_op, "responses", "200")
+        hadrian_resp = _json_schema(hadrian_op, "responses", "200")
 
         if openai_resp and hadrian_resp:
             resolved_openai = self.openai_resolver.resolve_schema(openai_resp)
@@ -651,8 +801,7 @@ class ConformanceChecker:
                     description=f"Query parameter '{param_name}' missing in Hadrian",
                 ))
                 # Check if documented
-                key = (path, method_upper, "param", param_name)
-                if key not in DOCUMENTED_MISSING_FIELDS:
+                if not self._is_documented_missing(path, method_upper, "param", param_name):
                     violations.append(Violation(
                         violation_type="undocumented_missing",
                         path=path,
@@ -697,12 +846,38 @@ class ConformanceChecker:
         """Compare two resolved schemas."""
         diffs: list[SchemaDiff] = []
         violations: list[Violation] = []
+        self._compare_schemas_into(
+            openai_schema, hadrian_schema, context, endpoint_path, method, location, diffs, violations,
+        )
+        return diffs, violations
+
+    def _compare_schemas_into(
+        self,
+        openai_schema: dict,
+        hadrian_schema: dict,
+        context: str,
+        endpoint_path: str,
+        method: str,
+        location: str,
+        diffs: list[SchemaDiff],
+        violations: list[Violation],
+    ) -> None:
+        """Body of `_compare_schemas`, appending to the caller's lists.
+
+        Nested objects and union variants recurse into the same lists, so
+        results are not copied up through every level of nesting.
+        """
+        # Identical subtrees (e.g. a component Hadrian copied verbatim) can't
+        # differ; dict equality rules them out in C without the field walk
+        if openai_schema == hadrian_schema:
+            return
 
         openai_props = openai_schema.get("properties", {})
         hadrian_props = hadrian_schema.get("properties", {})
 
-        openai_required = set(openai_schema.get("required", []))
-        hadrian_required = set(hadrian_schema.get("required", []))
+        openai_required = _required_set(openai_schema)
+        hadrian_required = _required_set(hadrian_schema)
+        documented_missing = _documented_missing_for(endpoint_path, method, location)
 
         # Fields in OpenAI but not Hadrian
         for field_name, openai_field in openai_props.items():
@@ -717,8 +892,9 @@ class ConformanceChecker:
                     description=f"Field '{field_name}' ({field_type}) missing in Hadrian" + (" [REQUIRED]" if is_required else ""),
                 ))
                 # Check if documented
-                key = (endpoint_path, method, location, field_name)
-                if key not in DOCUMENTED_MISSING_FIELDS:
+                if field_name in documented_missing:
+                    self._documented_hits.add((endpoint_path, method, location, field_name))
+                else:
                     violations.append(Violation(
                         violation_type="undocumented_missing",
                         path=endpoint_path,
@@ -751,10 +927,11 @@ class ConformanceChecker:
                         message=f"Field '{field_name}' is a Hadrian extension but missing '{EXTENSION_MARKER}' in description",
                     ))
 
-        # Compare common fields
-        for field_name in set(openai_props.keys()) & set(hadrian_props.keys()):
-            openai_field = openai_props[field_name]
-            hadrian_field = hadrian_props[field_name]
+        # Compare common fields, in OpenAI's declaration order
+        for field_name, openai_field in openai_props.items():
+            hadrian_field = hadrian_props.get(field_name)
+            if hadrian_field is None:
+                continue
 
             # Check type mismatch
             openai_type = self._get_type_string(openai_field)
@@ -785,16 +962,16 @@ class ConformanceChecker:
 
             # Recursively compare nested objects
             if openai_field.get("type") == "object" and hadrian_field.get("type") == "object":
-                nested_diffs, nested_violations = self._compare_schemas(
+                self._compare_schemas_into(
                     openai_field,
                     hadrian_field,
                     f"{context}.{field_name}",
                     endpoint_path,
                     method,
                     location,
+                    diffs,
+                    violations,
                 )
-                diffs.extend(nested_diffs)
-                violations.extend(nested_violations)
 
             # Recurse into discriminated array<oneOf> shapes (e.g.
             # `tools[]`, `input[]`, `output[]`). Each known `type`
@@ -803,18 +980,16 @@ class ConformanceChecker:
             # surface in the report. Handles OpenAPI 3.1's nullable
             # form `type: ["array", "null"]` on either side.
             if _is_array_type(openai_field) and _is_array_type(hadrian_field):
-                u_diffs, u_violations = self._compare_union_items(
+                self._compare_union_items(
                     openai_field.get("items", {}),
                     hadrian_field.get("items", {}),
                     f"{context}.{field_name}[]",
                     endpoint_path,
                     method,
                     location,
+                    diffs,
+                    violations,
                 )
-                diffs.extend(u_diffs)
-                violations.extend(u_violations)
-
-        return diffs, violations
 
     def _compare_union_items(
         self,
@@ -824,21 +999,21 @@ class ConformanceChecker:
         endpoint_path: str,
         method: str,
         location: str,
-    ) -> tuple[list[SchemaDiff], list[Violation]]:
+        diffs: list[SchemaDiff],
+        violations: list[Violation],
+    ) -> None:
         """Compare two discriminated-union `items` schemas.
 
         For each `type` literal present on either side, run
         `_compare_schemas` on the matching variant pair. Variants only
         on one side produce a single diff entry (missing or extension);
-        we do not recurse into them.
+        we do not recurse into them. Results are appended to `diffs`
+        and `violations`.
         """
-        diffs: list[SchemaDiff] = []
-        violations: list[Violation] = []
-
         openai_variants = openai_items.get("_union_variants") if isinstance(openai_items, dict) else None
         hadrian_variants = hadrian_items.get("_union_variants") if isinstance(hadrian_items, dict) else None
         if not openai_variants or not hadrian_variants:
-            return diffs, violations
+            return
 
         # Strip the leading "<path> request"/" response" prefix the
         # caller threaded through `context`, so the variant key matches
@@ -852,7 +1027,7 @@ class ConformanceChecker:
         if short_context.endswith("[]"):
             short_context = short_context[:-2]
 
-        all_type_values = set(openai_variants.keys()) | set(hadrian_variants.keys())
+        all_type_values = openai_variants.keys() | hadrian_variants.keys()
         for type_value in sorted(all_type_values):
             openai_variant = openai_variants.get(type_value)
             hadrian_variant = hadrian_variants.get(type_value)
@@ -876,8 +1051,7 @@ class ConformanceChecker:
                     openai_value="object",
                     description=f"Variant '{type_value}' missing in Hadrian",
                 ))
-                key = (endpoint_path, method, location, variant_key)
-                if key not in DOCUMENTED_MISSING_FIELDS:
+                if not self._is_documented_missing(endpoint_path, method, location, variant_key):
                     violations.append(Violation(
                         violation_type="undocumented_missing",
                         path=endpoint_path,
@@ -888,29 +1062,42 @@ class ConformanceChecker:
                     ))
                 continue
 
-            v_diffs, v_violations = self._compare_schemas(
+            first_variant_diff = len(diffs)
+            self._compare_schemas_into(
                 openai_variant,
                 hadrian_variant,
                 variant_context,
                 endpoint_path,
                 method,
                 location,
+                diffs,
+                violations,
             )
             # Tag each within-variant diff with its discriminator so
             # `cache_control on file_search` reads as such in the
             # report instead of an undifferentiated "Field 'cache_control'".
-            for d in v_diffs:
+            for d in diffs[first_variant_diff:]:
                 d.description = f"[{type_value}] {d.description}"
-            diffs.extend(v_diffs)
-            violations.extend(v_violations)
-
-        return diffs, violations
 
     def _get_type_string(self, schema: dict) -> str:
-        """Get a human-readable type string from a schema."""
+        """Get a human-readable type string from a schema.
+
+        Resolved schemas are shared between every endpoint that references
+        them, so results are cached per schema object (kept alive in the
+        cache so the id stays valid).
+        """
         if not isinstance(schema, dict):
             return str(schema)
 
+        cached = self._type_string_cache.get(id(schema))
+        if cached is not None:
+            return cached[1]
+        type_string = self._format_type_string(schema)
+        self._type_string_cache[id(schema)] = (schema, type_string)
+        return type_string
+
+    def _format_type_string(self, schema: dict) -> str:
+        """Uncached body of `_get_type_string`."""
         schema_type = schema.get("type")
 
         # Handle array types in OpenAPI 3.1 format: ["string", "null"]
@@ -942,21 +1129,37 @@ class ConformanceChecker:
 
     def _types_compatible(self, openai_type: str, hadrian_type: str) -> bool:
         """Check if two types are compatible."""
-        # Exact match
-        if openai_type == hadrian_type:
-            return True
+        return openai_type == hadrian_type or (openai_type, hadrian_type) in _COMPATIBLE_TYPE_PAIRS
 
-        # integer/number compatibility
-        if {openai_type, hadrian_type} <= {"integer", "number"}:
-            return True
 
-        # Double is compatible with number
-        if openai_type == "number" and hadrian_type == "double":
-            return True
-        if hadrian_type == "number" and openai_type == "double":
-            return True
+# Text report marker for each diff type, and the legend printed under it
+_DIFF_ICONS = {
+    DiffType.MISSING_IN_HADRIAN: "[-]",
+    DiffType.HADRIAN_EXTENSION: "[+]",
+    DiffType.TYPE_MISMATCH: "[~]",
+    DiffType.REQUIRED_MISMATCH: "[!]",
+}
+_DIFF_ICON_LEGEND = {
+    DiffType.MISSING_IN_HADRIAN: "Missing in Hadrian",
+    DiffType.HADRIAN_EXTENSION: "Hadrian extension",
+    DiffType.TYPE_MISMATCH: "Type mismatch",
+    DiffType.REQUIRED_MISMATCH: "Required/optional mismatch",
+}
 
-        return False
+
+def _load_json(path: Path) -> Any:
+    """Parse a JSON file, with orjson when available (the specs are several MB)."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path) as f:
+        return json.load(f)
+
+
+def _dump_json(data: Any) -> str:
+    """Serialize a report as indented JSON, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
 
 
 def format_text_report(report: ConformanceReport) -> str:
@@ -990,39 +1193,33 @@ def format_text_report(report: ConformanceReport) -> str:
                 lines.append("  [MISSING] Endpoint not implemented in Hadrian")
                 continue
 
-            if diff.request_diffs:
-                lines.append("  Request body differences:")
-                for schema_diff in diff.request_diffs:
-                    icon = "[-]" if schema_diff.diff_type == DiffType.MISSING_IN_HADRIAN else "[+]"
-                    if schema_diff.diff_type == DiffType.TYPE_MISMATCH:
-                        icon = "[~]"
-                    elif schema_diff.diff_type == DiffType.REQUIRED_MISMATCH:
-                        icon = "[!]"
-                    lines.append(f"    {icon} {schema_diff.description}")
-
-            if diff.response_diffs:
-                lines.append("  Response body differences:")
-                for schema_diff in diff.response_diffs:
-                    icon = "[-]" if schema_diff.diff_type == DiffType.MISSING_IN_HADRIAN else "[+]"
-                    if schema_diff.diff_type == DiffType.TYPE_MISMATCH:
-                        icon = "[~]"
-                    elif schema_diff.diff_type == DiffType.REQUIRED_MISMATCH:
-                        icon = "[!]"
-                    lines.append(f"    {icon} {schema_diff.description}")
-
-            if diff.param_diffs:
-                lines.append("  Query parameter differences:")
-                for schema_diff in diff.param_diffs:
-                    icon = "[-]" if schema_diff.diff_type == DiffType.MISSING_IN_HADRIAN else "[+]"
-                    lines.append(f"    {icon} {schema_diff.description}")
+            for heading, schema_diffs in (
+                ("  Request body differences:", diff.request_diffs),
+                ("  Response body differences:", diff.response_diffs),
+                ("  Query parameter differences:", diff.param_diffs),
+            ):
+                if schema_diffs:
+                    lines.append(heading)
+                    lines.extend(
+                        f"    {_DIFF_ICONS[d.diff_type]} {d.description}" for d in schema_diffs
+                    )
 
     if report.hadrian_only_endpoints:
         lines.append("")
         lines.append("-" * 70)
         lines.append("Hadrian Extension Endpoints:")
         lines.append("-" * 70)
-        for path in report.hadrian_only_endpoints:
-            lines.append(f"  [+] {path}")
+        lines.extend(f"  [+] {path}" for path in report.hadrian_only_endpoints)
+
+    if report.stale_documented_fields:
+        lines.append("")
+        lines.append("-" * 70)
+        lines.append("Stale DOCUMENTED_MISSING_FIELDS entries (no longer missing, remove them):")
+        lines.append("-" * 70)
+        lines.extend(
+            f"  - {method} {path} [{location}] {field_name}"
+            for path, method, location, field_name in report.stale_documented_fields
+        )
 
     # CI Violations section
     if report.violations:
@@ -1031,28 +1228,33 @@ def format_text_report(report: ConformanceReport) -> str:
         lines.append("CI VIOLATIONS (will cause CI to fail)")
         lines.append("=" * 70)
 
-        # Group violations by type
-        missing_endpoints = [v for v in report.violations if v.violation_type == "missing_endpoint"]
-        undocumented = [v for v in report.violations if v.violation_type == "undocumented_missing"]
-        unmarked = [v for v in report.violations if v.violation_type == "unmarked_extension"]
+        # Group violations by type in one pass
+        missing_endpoints: list[Violation] = []
+        undocumented: list[Violation] = []
+        unmarked: list[Violation] = []
+        for v in report.violations:
+            match v.violation_type:
+                case "missing_endpoint":
+                    missing_endpoints.append(v)
+                case "undocumented_missing":
+                    undocumented.append(v)
+                case "unmarked_extension":
+                    unmarked.append(v)
 
         if missing_endpoints:
             lines.append("")
             lines.append("Missing Endpoints (must be implemented):")
-            for v in missing_endpoints:
-                lines.append(f"  - {v.method} {v.path}")
+            lines.extend(f"  - {v.method} {v.path}" for v in missing_endpoints)
 
         if undocumented:
             lines.append("")
             lines.append("Undocumented Missing Fields (add to DOCUMENTED_MISSING_FIELDS):")
-            for v in undocumented:
-                lines.append(f"  - {v.method} {v.path} [{v.location}] {v.field}")
+            lines.extend(f"  - {v.method} {v.path} [{v.location}] {v.field}" for v in undocumented)
 
         if unmarked:
             lines.append("")
             lines.append(f"Unmarked Extensions (add '{EXTENSION_MARKER}' to description):")
-            for v in unmarked:
-                lines.append(f"  - {v.method} {v.path} [{v.location}] {v.field}")
+            lines.extend(f"  - {v.method} {v.path} [{v.location}] {v.field}" for v in unmarked)
 
         lines.append("")
         lines.append(f"Total violations: {len(report.violations)}")
@@ -1064,47 +1266,13 @@ def format_text_report(report: ConformanceReport) -> str:
 
     lines.append("")
     lines.append("Legend:")
-    lines.append("  [-] Missing in Hadrian")
-    lines.append("  [+] Hadrian extension")
-    lines.append("  [~] Type mismatch")
-    lines.append("  [!] Required/optional mismatch")
+    lines.extend(f"  {_DIFF_ICONS[diff_type]} {meaning}" for diff_type, meaning in _DIFF_ICON_LEGEND.items())
 
     return "\n".join(lines)
 
 
 def format_json_report(report: ConformanceReport) -> str:
     """Format report as JSON."""
-    def diff_to_dict(diff: SchemaDiff) -> dict:
-        return {
-            "path": diff.path,
-            "field": diff.field,
-            "type": diff.diff_type.value,
-            "openai_value": diff.openai_value,
-            "hadrian_value": diff.hadrian_value,
-            "description": diff.description,
-        }
-
-    def endpoint_to_dict(diff: EndpointDiff) -> dict:
-        return {
-            "path": diff.path,
-            "method": diff.method,
-            "missing_in_hadrian": diff.missing_in_hadrian,
-            "hadrian_extension": diff.hadrian_extension,
-            "request_diffs": [diff_to_dict(d) for d in diff.request_diffs],
-            "response_diffs": [diff_to_dict(d) for d in diff.response_diffs],
-            "param_diffs": [diff_to_dict(d) for d in diff.param_diffs],
-        }
-
-    def violation_to_dict(v: Violation) -> dict:
-        return {
-            "type": v.violation_type,
-            "path": v.path,
-            "method": v.method,
-            "field": v.field,
-            "location": v.location,
-            "message": v.message,
-        }
-
     data = {
         "openai_version": report.openai_version,
         "hadrian_version": report.hadrian_version,
@@ -1118,13 +1286,17 @@ def format_json_report(report: ConformanceReport) -> str:
             "hadrian_extensions": len(report.hadrian_only_endpoints),
             "violations": len(report.violations),
         },
-        "violations": [violation_to_dict(v) for v in report.violations],
-        "endpoints_with_diffs": [endpoint_to_dict(d) for d in report.endpoints_with_diffs],
+        "violations": [v.to_dict() for v in report.violations],
+        "endpoints_with_diffs": [d.to_dict() for d in report.endpoints_with_diffs],
         "hadrian_only_endpoints": report.hadrian_only_endpoints,
         "out_of_scope_endpoints": report.out_of_scope_endpoints,
+        "stale_documented_fields": [
+            {"path": path, "method": method, "location": location, "field": field_name}
+            for path, method, location, field_name in report.stale_documented_fields
+        ],
     }
 
-    return json.dumps(data, indent=2)
+    return _dump_json(data)
 
 
 def main():
@@ -1180,11 +1352,8 @@ def main():
         sys.exit(1)
 
     # Load specs
-    with open(openai_path) as f:
-        openai_spec = json.load(f)
-
-    with open(hadrian_path) as f:
-        hadrian_spec = json.load(f)
+    openai_spec = _load_json(openai_path)
+    hadrian_spec = _load_json(hadrian_path)
 
     # Run conformance check
     checker = ConformanceChecker(openai_spec, hadrian_spec, verbose=args.verbose)
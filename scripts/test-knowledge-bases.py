@@ -2,9 +2,12 @@
 # /// script
 # requires-python = ">=3.12"
 # dependencies = [
-#     "httpx>=0.27",
+#     "httpx[http2]>=0.27",
 #     "beautifulsoup4>=4.12",
+#     "lxml>=5.0",
+#     "orjson>=3.9",
 #     "rich>=13.7",
+#     "selectolax>=0.3.21",
 # ]
 # ///
 """
@@ -26,37 +29,57 @@ Usage:
     ./scripts/test-knowledge-bases.py --dry-run          # Fetch only, don't upload
     ./scripts/test-knowledge-bases.py --list-sources     # Show available sources
     ./scripts/test-knowledge-bases.py --max-file-size 5  # Skip files larger than 5 MB
+    ./scripts/test-knowledge-bases.py --force-upload     # Re-upload unchanged documents
+    ./scripts/test-knowledge-bases.py --verbose          # Report every upload and deletion
+    ./scripts/test-knowledge-bases.py --quiet --log-file kb.log  # No output; errors to kb.log
 
 Environment variables:
     HADRIAN_API_KEY  - API key for authentication (default: test-key)
     HADRIAN_ORG_ID   - Organization ID for ownership (default: test org)
     GATEWAY_URL      - Gateway URL (default: http://localhost:8080)
+    XDG_CACHE_HOME   - Where uploaded document hashes are cached (default: ~/.cache)
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import functools
 import hashlib
+import html
+import io
+import itertools
+import json
+import logging
 import os
+import random
 import re
 import sys
 import tempfile
 import time
 import xml.etree.ElementTree as ET
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Iterator
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 from urllib.parse import urljoin, urlparse
 
 import httpx
+import orjson
 from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
 from rich.console import Console
+from rich.logging import RichHandler
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
+from selectolax.lexbor import LexborHTMLParser
 
 console = Console()
+log = logging.getLogger("test-knowledge-bases")
 
 
 # =============================================================================
@@ -75,9 +98,17 @@ class Config:
     timeout: float = 30.0
     embedding_model: str = "text-embedding-3-small"
     max_file_size_mb: float = 10.0
+    force_upload: bool = False
+    upload_concurrency: int = 8
+    # Report each upload, processing status and deletion, not just per-source totals
+    verbose: bool = False
+    # Stamped on everything the run creates, so retries record the same time
+    run_started_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
     @classmethod
+    @functools.cache
     def from_env(cls) -> Config:
+        """Defaults from the environment. Cached, so treat the result as read-only."""
         return cls(
             gateway_url=os.environ.get("GATEWAY_URL", "http://localhost:8080"),
             api_key=os.environ.get("HADRIAN_API_KEY", "test-key"),
@@ -89,13 +120,38 @@ class Config:
 class Document:
     """A document fetched from a source."""
     title: str
-    content: bytes
+    # Large downloads are spooled to a temporary file instead of held in memory
+    content: bytes | Path
     filename: str
     content_type: str
     source: str
     source_url: str
     metadata: dict[str, str] = field(default_factory=dict)
 
+    @property
+    def size(self) -> int:
+        """Content size in bytes."""
+        if isinstance(self.content, Path):
+            return self.content.stat().st_size
+        return len(self.content)
+
+    def open(self) -> IO[bytes]:
+        """Open the content for reading."""
+        if isinstance(self.content, Path):
+            return self.content.open("rb")
+        return io.BytesIO(self.content)
+
+    def content_hash(self) -> str:
+        """Digest of the content, used to detect unchanged documents."""
+        with self.open() as f:
+            return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+
+    def discard(self) -> None:
+        """Release the content, removing it from disk if it was spooled there."""
+        if isinstance(self.content, Path):
+            self.content.unlink(missing_ok=True)
+        self.content = b""
+
 
 @dataclass
 class FetchResult:
@@ -103,6 +159,16 @@ class FetchResult:
     source_name: str
     documents: list[Document] = field(default_factory=list)
     errors: list[str] = field(default_factory=list)
+    # (title, size in bytes) of documents dropped for exceeding the size limit
+    oversized: list[tuple[str, int]] = field(default_factory=list)
+
+
+class DocumentTooLarge(Exception):
+    """Raised when a download is abandoned for exceeding the size limit."""
+
+    def __init__(self, size: int):
+        super().__init__(f"document exceeds size limit ({size} bytes)")
+        self.size = size
 
 
 # =============================================================================
@@ -110,17 +176,72 @@ class FetchResult:
 # =============================================================================
 
 
-def create_client(timeout: float = 30.0) -> httpx.Client:
-    """Create HTTP client with sensible defaults."""
-    return httpx.Client(
+def create_client(timeout: float = 30.0) -> httpx.AsyncClient:
+    """Create HTTP client with sensible defaults.
+
+    One client is shared by all sources so connections are kept alive between
+    them, and HTTP/2 multiplexes concurrent requests to the same host.
+    """
+    return httpx.AsyncClient(
         timeout=timeout,
         follow_redirects=True,
+        http2=True,
+        # Sources fetch documents concurrently and all run at once; the pool
+        # is shared, so allow roughly ten connections per source and keep
+        # them alive between sources
+        limits=httpx.Limits(max_connections=40, max_keepalive_connections=32),
         headers={
             "User-Agent": "Hadrian-Gateway-Test/1.0 (https://github.com/hadriangateway/hadrian)",
         },
     )
 
 
+# =============================================================================
+# Feed Parsing
+# =============================================================================
+
+
+# Namespace-qualified Atom tags, so lookups skip ElementTree's prefix resolution
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ATOM_ENTRY = f"{ATOM_NS}entry"
+ATOM_TITLE = f"{ATOM_NS}title"
+ATOM_CONTENT = f"{ATOM_NS}content"
+ATOM_SUMMARY = f"{ATOM_NS}summary"
+ATOM_LINK = f"{ATOM_NS}link"
+ATOM_ALTERNATE_LINK = f"{ATOM_LINK}[@rel='alternate']"
+ATOM_PUBLISHED = f"{ATOM_NS}published"
+ATOM_ID = f"{ATOM_NS}id"
+ATOM_AUTHOR = f"{ATOM_NS}author"
+ATOM_NAME = f"{ATOM_NS}name"
+ATOM_CATEGORY = f"{ATOM_NS}category"
+
+
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+HTML_SCRIPT_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.DOTALL | re.IGNORECASE)
+
+
+def strip_html(fragment: str) -> str:
+    """Extract the text of a small HTML fragment, one text run per line."""
+    text = HTML_TAG_RE.sub("\n", HTML_SCRIPT_RE.sub("", fragment))
+    return "\n".join(line for raw in html.unescape(text).split("\n") if (line := raw.strip()))
+
+
+def iter_atom_entries(content: bytes, max_docs: int) -> Iterator[ET.Element]:
+    """Yield up to max_docs Atom entries, stopping the parse once enough are read."""
+    if max_docs <= 0:
+        return
+
+    count = 0
+    for _, elem in ET.iterparse(io.BytesIO(content), events=("end",)):
+        if elem.tag == ATOM_ENTRY:
+            yield elem
+            # Drop the entry's children so memory stays flat on large feeds
+            elem.clear()
+            count += 1
+            if count >= max_docs:
+                return
+
+
 # =============================================================================
 # Document Sources
 # =============================================================================
@@ -142,8 +263,12 @@ class DocumentSource(ABC):
         ...
 
     @abstractmethod
-    def fetch(self, client: httpx.Client, max_docs: int) -> FetchResult:
-        """Fetch documents from the source."""
+    async def fetch(self, client: httpx.AsyncClient, max_docs: int, max_bytes: int) -> FetchResult:
+        """Fetch documents from the source.
+
+        Sources that download large files should abandon any larger than
+        `max_bytes` and record them in `FetchResult.oversized`.
+        """
         ...
 
 
@@ -151,6 +276,8 @@ class SimonWillisonSource(DocumentSource):
     """Simon Willison's blog - AI, Python, and web development."""
 
     FEED_URL = "https://simonwillison.net/atom/everything/"
+    SLUG_STRIP_RE = re.compile(r"[^\w\s-]")
+    SLUG_DASHES_RE = re.compile(r"[-\s]+")
 
     @property
     def name(self) -> str:
@@ -160,49 +287,45 @@ class SimonWillisonSource(DocumentSource):
     def description(self) -> str:
         return "Simon Willison's blog (AI, Python, web development)"
 
-    def fetch(self, client: httpx.Client, max_docs: int) -> FetchResult:
+    async def fetch(self, client: httpx.AsyncClient, max_docs: int, max_bytes: int) -> FetchResult:
         result = FetchResult(source_name=self.name)
 
         try:
-            response = client.get(self.FEED_URL)
+            response = await client.get(self.FEED_URL)
             response.raise_for_status()
 
             # Parse Atom feed
-            root = ET.fromstring(response.content)
-            ns = {"atom": "http://www.w3.org/2005/Atom"}
-
-            for entry in root.findall("atom:entry", ns)[:max_docs]:
+            for entry in iter_atom_entries(response.content, max_docs):
                 try:
-                    title_elem = entry.find("atom:title", ns)
+                    title_elem = entry.find(ATOM_TITLE)
                     title = title_elem.text.strip() if title_elem is not None and title_elem.text else "Untitled"
 
                     # Get the content or summary
-                    content_elem = entry.find("atom:content", ns)
+                    content_elem = entry.find(ATOM_CONTENT)
                     if content_elem is None:
-                        content_elem = entry.find("atom:summary", ns)
+                        content_elem = entry.find(ATOM_SUMMARY)
 
                     if content_elem is not None and content_elem.text:
-                        html_content = content_elem.text
-                        # Extract text from HTML
-                        soup = BeautifulSoup(html_content, "html.parser")
-                        text_content = soup.get_text(separator="\n", strip=True)
+                        # Feed bodies are small, well-formed fragments, so a
+                        # regex tag stripper is enough to extract the text
+                        text_content = strip_html(content_elem.text)
                     else:
                         text_content = ""
 
                     # Get the link
-                    link_elem = entry.find("atom:link[@rel='alternate']", ns)
+                    link_elem = entry.find(ATOM_ALTERNATE_LINK)
                     if link_elem is None:
-                        link_elem = entry.find("atom:link", ns)
+                        link_elem = entry.find(ATOM_LINK)
                     url = link_elem.get("href", "") if link_elem is not None else ""
 
                     # Get published date
-                    published_elem = entry.find("atom:published", ns)
+                    published_elem = entry.find(ATOM_PUBLISHED)
                     published = published_elem.text if published_elem is not None else ""
 
-                    if text_content and len(text_content) > 100:
+                    if len(text_content) > 100:
                         # Create a slug from title
-                        slug = re.sub(r"[^\w\s-]", "", title.lower())
-                        slug = re.sub(r"[-\s]+", "-", slug).strip("-")[:50]
+                        slug = self.SLUG_STRIP_RE.sub("", title.lower())
+                        slug = self.SLUG_DASHES_RE.sub("-", slug).strip("-")[:50]
 
                         result.documents.append(Document(
                             title=title,
@@ -234,6 +357,20 @@ class RFCSource(DocumentSource):
         "https://datatracker.ietf.org/doc/html/rfc{num}",
     ]
 
+    # Well-known RFCs, selected for their relevance and reasonable size
+    RECENT_RFCS = (
+        ("8259", "JSON"),  # Smaller, more likely to succeed
+        ("7231", "HTTP/1.1 Semantics"),
+        ("7230", "HTTP/1.1 Message Syntax"),
+        ("6749", "OAuth 2.0"),
+        ("7519", "JSON Web Token (JWT)"),
+        ("7540", "HTTP/2"),
+        ("8446", "TLS 1.3"),
+        ("9110", "HTTP Semantics"),
+        ("9111", "HTTP Caching"),
+        ("9112", "HTTP/1.1"),
+    )
+
     @property
     def name(self) -> str:
         return "rfc"
@@ -242,74 +379,70 @@ class RFCSource(DocumentSource):
     def description(self) -> str:
         return "IETF RFC (Request for Comments) documents"
 
-    def fetch(self, client: httpx.Client, max_docs: int) -> FetchResult:
+    async def fetch(self, client: httpx.AsyncClient, max_docs: int, max_bytes: int) -> FetchResult:
         result = FetchResult(source_name=self.name)
 
         # Fetch some well-known RFCs directly
-        # These are selected for their relevance and reasonable size
-        recent_rfcs = [
-            ("8259", "JSON"),  # Smaller, more likely to succeed
-            ("7231", "HTTP/1.1 Semantics"),
-            ("7230", "HTTP/1.1 Message Syntax"),
-            ("6749", "OAuth 2.0"),
-            ("7519", "JSON Web Token (JWT)"),
-            ("7540", "HTTP/2"),
-            ("8446", "TLS 1.3"),
-            ("9110", "HTTP Semantics"),
-            ("9111", "HTTP Caching"),
-            ("9112", "HTTP/1.1"),
-        ]
-
-        for rfc_num, title in recent_rfcs[:max_docs]:
-            fetched = False
-
-            # Try multiple URL patterns
-            for url_template in self.RFC_URLS:
-                if fetched:
-                    break
-
-                try:
-                    url = url_template.format(num=rfc_num)
-                    response = client.get(url)
-                    response.raise_for_status()
-
-                    content = response.content
-                    content_type = response.headers.get("content-type", "text/plain")
-
-                    # If it's HTML, extract text
-                    if "html" in content_type.lower():
-                        soup = BeautifulSoup(response.text, "html.parser")
-                        # Remove script and style elements
-                        for tag in soup(["script", "style", "nav", "header", "footer"]):
-                            tag.decompose()
-                        text = soup.get_text(separator="\n", strip=True)
-                        content = text.encode("utf-8")
-                        content_type = "text/plain"
-
-                    result.documents.append(Document(
-                        title=f"RFC {rfc_num}: {title}",
-                        content=content,
-                        filename=f"rfc{rfc_num}.txt",
-                        content_type=content_type.split(";")[0],
-                        source=self.name,
-                        source_url=url,
-                        metadata={"rfc_number": rfc_num, "category": "standards"},
-                    ))
-                    fetched = True
-
-                except httpx.HTTPError:
-                    continue
+        recent_rfcs = self.RECENT_RFCS[:max_docs]
 
-            if not fetched:
+        docs = await asyncio.gather(
+            *(self.fetch_rfc(client, rfc_num, title) for rfc_num, title in recent_rfcs)
+        )
+        for (rfc_num, _), doc in zip(recent_rfcs, docs):
+            if doc is None:
                 result.errors.append(f"Failed to fetch RFC {rfc_num} from all sources")
+            else:
+                result.documents.append(doc)
 
         return result
 
+    async def fetch_rfc(self, client: httpx.AsyncClient, rfc_num: str, title: str) -> Document | None:
+        """Fetch a single RFC, trying each URL pattern in turn."""
+        for url_template in self.RFC_URLS:
+            try:
+                url = url_template.format(num=rfc_num)
+                response = await client.get(url)
+                response.raise_for_status()
+            except httpx.HTTPError:
+                continue
+
+            content = response.content
+            content_type = response.headers.get("content-type", "text/plain")
+
+            # If it's HTML, extract text
+            if "html" in content_type.lower():
+                # Parse the raw bytes rather than decoding the whole page to str first
+                soup = BeautifulSoup(response.content, "lxml", from_encoding=response.charset_encoding)
+                # Remove script and style elements
+                for tag in soup(["script", "style", "nav", "header", "footer"]):
+                    tag.decompose()
+                text = soup.get_text(separator="\n", strip=True)
+                content = text.encode("utf-8")
+                content_type = "text/plain"
+
+            return Document(
+                title=f"RFC {rfc_num}: {title}",
+                content=content,
+                filename=f"rfc{rfc_num}.txt",
+                content_type=content_type.split(";")[0],
+                source=self.name,
+                source_url=url,
+                metadata={"rfc_number": rfc_num, "category": "standards"},
+            )
+
+        return None
+
 
 class ArxivSource(DocumentSource):
     """arXiv preprint papers."""
 
     API_URL = "https://export.arxiv.org/api/query"
+    # Search for recent CS papers
+    SEARCH_PARAMS = {
+        "search_query": "cat:cs.AI OR cat:cs.LG OR cat:cs.CL",  # AI, ML, NLP
+        "sortBy": "submittedDate",
+        "sortOrder": "descending",
+    }
 
     @property
     def name(self) -> str:
@@ -319,38 +452,30 @@ class ArxivSource(DocumentSource):
     def description(self) -> str:
         return "arXiv preprint papers (computer science)"
 
-    def fetch(self, client: httpx.Client, max_docs: int) -> FetchResult:
+    async def fetch(self, client: httpx.AsyncClient, max_docs: int, max_bytes: int) -> FetchResult:
         result = FetchResult(source_name=self.name)
 
         try:
-            # Search for recent CS papers
-            params = {
-                "search_query": "cat:cs.AI OR cat:cs.LG OR cat:cs.CL",  # AI, ML, NLP
-                "sortBy": "submittedDate",
-                "sortOrder": "descending",
-                "max_results": str(max_docs),
-            }
-
-            response = client.get(self.API_URL, params=params)
+            params = {**self.SEARCH_PARAMS, "max_results": str(max_docs)}
+            response = await client.get(self.API_URL, params=params)
             response.raise_for_status()
 
-            # Parse Atom feed
-            root = ET.fromstring(response.content)
-            ns = {"atom": "http://www.w3.org/2005/Atom"}
+            # Parse Atom feed, collecting papers whose PDFs still need fetching
+            papers: list[tuple[str, str, dict[str, str]]] = []
 
-            for entry in root.findall("atom:entry", ns)[:max_docs]:
+            for entry in iter_atom_entries(response.content, max_docs):
                 try:
-                    title_elem = entry.find("atom:title", ns)
+                    title_elem = entry.find(ATOM_TITLE)
                     title = title_elem.text.strip() if title_elem is not None else "Untitled"
                     title = " ".join(title.split())  # Normalize whitespace
 
                     # Get the abstract
-                    summary_elem = entry.find("atom:summary", ns)
+                    summary_elem = entry.find(ATOM_SUMMARY)
                     abstract = summary_elem.text.strip() if summary_elem is not None else ""
                     abstract = " ".join(abstract.split())
 
                     # Get the ID (e.g., 2401.12345v1)
-                    id_elem = entry.find("atom:id", ns)
+                    id_elem = entry.find(ATOM_ID)
                     if id_elem is not None:
                         arxiv_id = id_elem.text.split("/abs/")[-1]
                     else:
@@ -358,45 +483,53 @@ class ArxivSource(DocumentSource):
 
                     # Get authors
                     authors = []
-                    for author in entry.findall("atom:author", ns):
-                        name_elem = author.find("atom:name", ns)
+                    for author in entry.findall(ATOM_AUTHOR):
+                        name_elem = author.find(ATOM_NAME)
                         if name_elem is not None:
                             authors.append(name_elem.text)
 
                     # Get categories
                     categories = []
-                    for cat in entry.findall("atom:category", ns):
+                    for cat in entry.findall(ATOM_CATEGORY):
                         term = cat.get("term")
                         if term:
                             categories.append(term)
 
-                    # Fetch PDF
-                    pdf_url = f"https://arxiv.org/pdf/{arxiv_id}.pdf"
-                    try:
-                        pdf_response = client.get(pdf_url)
-                        pdf_response.raise_for_status()
-
-                        result.documents.append(Document(
-                            title=title,
-                            content=pdf_response.content,
-                            filename=f"arxiv_{arxiv_id.replace('/', '_')}.pdf",
-                            content_type="application/pdf",
-                            source=self.name,
-                            source_url=pdf_url,
-                            metadata={
-                                "arxiv_id": arxiv_id,
-                                "authors": ", ".join(authors[:5]),
-                                "categories": ", ".join(categories[:3]),
-                                "abstract": abstract[:500],
-                            },
-                        ))
-
-                    except httpx.HTTPError as e:
-                        result.errors.append(f"Failed to fetch PDF for {arxiv_id}: {e}")
+                    papers.append((arxiv_id, title, {
+                        "arxiv_id": arxiv_id,
+                        "authors": ", ".join(authors[:5]),
+                        "categories": ", ".join(categories[:3]),
+                        "abstract": abstract[:500],
+                    }))
 
                 except Exception as e:
                     result.errors.append(f"Failed to parse arXiv entry: {e}")
 
+            # Fetch all PDFs concurrently
+            pdf_urls = [f"https://arxiv.org/pdf/{arxiv_id}.pdf" for arxiv_id, _, _ in papers]
+            pdf_responses = await asyncio.gather(
+                *(self.fetch_pdf(client, pdf_url, max_bytes) for pdf_url in pdf_urls),
+                return_exceptions=True,
+            )
+
+            for (arxiv_id, title, metadata), pdf_url, pdf_content in zip(papers, pdf_urls, pdf_responses):
+                if isinstance(pdf_content, DocumentTooLarge):
+                    result.oversized.append((title, pdf_content.size))
+                    continue
+                if isinstance(pdf_content, Exception):
+                    result.errors.append(f"Failed to fetch PDF for {arxiv_id}: {pdf_content}")
+                    continue
+
+                result.documents.append(Document(
+                    title=title,
+                    content=pdf_content,
+                    filename=f"arxiv_{arxiv_id.replace('/', '_')}.pdf",
+                    content_type="application/pdf",
+                    source=self.name,
+                    source_url=pdf_url,
+                    metadata=metadata,
+                ))
+
         except httpx.HTTPError as e:
             result.errors.append(f"Failed to query arXiv API: {e}")
         except ET.ParseError as e:
@@ -404,11 +537,42 @@ class ArxivSource(DocumentSource):
 
         return result
 
+    async def fetch_pdf(self, client: httpx.AsyncClient, pdf_url: str, max_bytes: int) -> Path:
+        """Stream a single paper PDF to a temporary file.
+
+        Raises DocumentTooLarge as soon as the PDF is known to exceed
+        `max_bytes`, from Content-Length if sent or else mid-download.
+        """
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+            pdf_path = Path(f.name)
+            try:
+                async with client.stream("GET", pdf_url) as response:
+                    response.raise_for_status()
+                    content_length = int(response.headers.get("Content-Length", 0))
+                    if content_length > max_bytes:
+                        raise DocumentTooLarge(content_length)
+                    async for chunk in response.aiter_bytes(chunk_size=65536):
+                        f.write(chunk)
+                        if f.tell() > max_bytes:
+                            raise DocumentTooLarge(f.tell())
+            except BaseException:
+                pdf_path.unlink(missing_ok=True)
+                raise
+
+        return pdf_path
+
 
 class AustLIISource(DocumentSource):
     """Australian Legal Information Institute cases and legislation."""
 
     BASE_URL = "https://www.austlii.edu.au"
+    CASE_LINK_RE = re.compile(r"/\d{4}/\d+\.html$")
+    # Court databases to take recent decisions from
+    COURTS = (
+        ("/au/cases/cth/HCA/", "High Court of Australia"),
+        ("/au/cases/cth/FCA/", "Federal Court of Australia"),
+        ("/au/cases/nsw/NSWSC/", "NSW Supreme Court"),
+    )
 
     @property
     def name(self) -> str:
@@ -418,162 +582,368 @@ class AustLIISource(DocumentSource):
     def description(self) -> str:
         return "Australian legal cases and legislation (AustLII)"
 
-    def fetch(self, client: httpx.Client, max_docs: int) -> FetchResult:
+    async def fetch(self, client: httpx.AsyncClient, max_docs: int, max_bytes: int) -> FetchResult:
         result = FetchResult(source_name=self.name)
 
-        # Fetch from specific court databases (recent decisions)
-        courts = [
-            ("/au/cases/cth/HCA/", "High Court of Australia"),
-            ("/au/cases/cth/FCA/", "Federal Court of Australia"),
-            ("/au/cases/nsw/NSWSC/", "NSW Supreme Court"),
-        ]
-
         docs_fetched = 0
-        for court_path, court_name in courts:
+        for court_path, court_name in self.COURTS:
             if docs_fetched >= max_docs:
                 break
 
             try:
                 # Get the index page for recent cases
                 index_url = f"{self.BASE_URL}{court_path}"
-                response = client.get(index_url)
+                response = await client.get(index_url)
                 response.raise_for_status()
 
-                soup = BeautifulSoup(response.text, "html.parser")
+                index = lxml_html.fromstring(response.content)
 
-                # Find links to case decisions
-                for link in soup.find_all("a", href=True):
-                    if docs_fetched >= max_docs:
+                # Find links to case decisions (e.g., /au/cases/cth/HCA/2024/1.html).
+                # Anchors are walked lazily so we stop once enough cases are found.
+                case_hrefs = (
+                    href
+                    for link in index.iter("a")
+                    if (href := link.get("href")) and self.CASE_LINK_RE.search(href)
+                )
+
+                # Fetch cases concurrently, topping up with further links
+                # until enough have succeeded or the index runs out
+                while docs_fetched < max_docs:
+                    batch = list(itertools.islice(case_hrefs, max_docs - docs_fetched))
+                    if not batch:
                         break
 
-                    href = link["href"]
-                    # Look for case links (e.g., /au/cases/cth/HCA/2024/1.html)
-                    if re.match(r".*/\d{4}/\d+\.html$", href):
-                        case_url = urljoin(self.BASE_URL, href)
-
-                        try:
-                            case_response = client.get(case_url)
-                            case_response.raise_for_status()
-
-                            case_soup = BeautifulSoup(case_response.text, "html.parser")
-
-                            # Extract case title
-                            title_elem = case_soup.find("title")
-                            title = title_elem.text.strip() if title_elem else "Untitled Case"
-
-                            # Extract case text
-                            content_div = case_soup.find("div", id="content") or case_soup.find("body")
-                            if content_div:
-                                text_content = content_div.get_text(separator="\n", strip=True)
-
-                                # Generate filename from URL
-                                filename = href.replace("/", "_").strip("_")
-                                if not filename.endswith(".txt"):
-                                    filename = filename.replace(".html", ".txt")
-
-                                result.documents.append(Document(
-                                    title=title,
-                                    content=text_content.encode("utf-8"),
-                                    filename=filename,
-                                    content_type="text/plain",
-                                    source=self.name,
-                                    source_url=case_url,
-                                    metadata={
-                                        "court": court_name,
-                                        "jurisdiction": "Australia",
-                                    },
-                                ))
-                                docs_fetched += 1
-
-                        except httpx.HTTPError as e:
-                            result.errors.append(f"Failed to fetch {case_url}: {e}")
+                    case_docs = await asyncio.gather(
+                        *(self.fetch_case(client, href, court_name) for href in batch),
+                        return_exceptions=True,
+                    )
+                    for href, doc in zip(batch, case_docs):
+                        if isinstance(doc, httpx.HTTPError):
+                            result.errors.append(f"Failed to fetch {urljoin(self.BASE_URL, href)}: {doc}")
+                        elif isinstance(doc, Exception):
+                            raise doc
+                        elif doc is not None:
+                            result.documents.append(doc)
+                            docs_fetched += 1
 
             except httpx.HTTPError as e:
                 result.errors.append(f"Failed to fetch {court_name} index: {e}")
+            except etree.ParserError as e:
+                result.errors.append(f"Failed to parse {court_name} index: {e}")
 
         return result
 
+    async def fetch_case(self, client: httpx.AsyncClient, href: str, court_name: str) -> Document | None:
+        """Fetch a single case decision and extract its text."""
+        case_url = urljoin(self.BASE_URL, href)
+        case_response = await client.get(case_url)
+        case_response.raise_for_status()
+
+        # Only the text is needed, so skip building a full BeautifulSoup tree
+        tree = LexborHTMLParser(case_response.text)
+        tree.strip_tags(["script", "style"])
+
+        # Extract case title
+        title_elem = tree.css_first("title")
+        title = title_elem.text(strip=True) if title_elem else "Untitled Case"
+
+        # Extract case text
+        content_div = tree.css_first("div#content") or tree.body
+        if not content_div:
+            return None
+        text = content_div.text(separator="\n", strip=True)
+        text_content = "\n".join(line for line in text.split("\n") if line)
+
+        # Generate filename from URL
+        filename = href.replace("/", "_").strip("_")
+        if not filename.endswith(".txt"):
+            filename = filename.replace(".html", ".txt")
+
+        return Document(
+            title=title,
+            content=text_content.encode("utf-8"),
+            filename=filename,
+            content_type="text/plain",
+            source=self.name,
+            source_url=case_url,
+            metadata={
+                "court": court_name,
+                "jurisdiction": "Australia",
+            },
+        )
+
+
+# =============================================================================
+# Upload Cache
+# =============================================================================
+
+
+UPLOAD_CACHE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "hadrian-test-kb"
+    / "hashes.json"
+)
+
+
+class UploadCache:
+    """Content hashes of documents already added to each vector store.
+
+    Lets re-runs against an existing store skip documents that haven't
+    changed since they were last uploaded.
+    """
+
+    def __init__(self, path: Path = UPLOAD_CACHE_PATH):
+        self.path = path
+        try:
+            self.stores: dict[str, dict[str, str]] = json.loads(path.read_text())
+        except (OSError, ValueError):
+            self.stores = {}
+
+    def is_current(self, vector_store_id: str, source_url: str, content_hash: str) -> bool:
+        """Whether this exact document content is already in the store."""
+        return self.stores.get(vector_store_id, {}).get(source_url) == content_hash
+
+    def check_store(self, store: dict[str, Any]) -> bool:
+        """Drop a store's entries if it holds fewer files than were recorded.
+
+        Files deleted from the store some other way would otherwise be
+        skipped on every run. Returns whether the entries were dropped.
+        """
+        recorded = self.stores.get(store["id"])
+        completed = store.get("file_counts", {}).get("completed")
+        if recorded and completed is not None and completed < len(recorded):
+            self.forget_store(store["id"])
+            return True
+        return False
+
+    def record(self, vector_store_id: str, source_url: str, content_hash: str) -> None:
+        """Remember that a document was added to a store."""
+        self.stores.setdefault(vector_store_id, {})[source_url] = content_hash
+
+    def forget_store(self, vector_store_id: str) -> None:
+        """Drop all entries for a deleted store."""
+        self.stores.pop(vector_store_id, None)
+
+    def save(self) -> None:
+        """Persist the cache to disk."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.stores, indent=2))
+        except OSError as e:
+            console.print(f"[yellow]Failed to save upload cache: {e}[/yellow]")
+
 
 # =============================================================================
 # Vector Store Operations
 # =============================================================================
 
 
+def parse_json(response: httpx.Response) -> Any:
+    """Decode a JSON response body (orjson parses the raw bytes directly)."""
+    return orjson.loads(response.content)
+
+
+# Error bodies can be whole HTML pages; only the start is useful
+ERROR_BODY_LIMIT = 500
+
+
+def log_response_body(response: httpx.Response) -> None:
+    """Log the (truncated) body of a failed response."""
+    log.warning(
+        "%s %s returned HTTP %d: %s",
+        response.request.method,
+        response.request.url,
+        response.status_code,
+        response.text[:ERROR_BODY_LIMIT],
+    )
+
+
+def log_error_body(e: httpx.HTTPError) -> None:
+    """Log the response body of a failed request, if it got a response."""
+    if isinstance(e, httpx.HTTPStatusError):
+        log_response_body(e.response)
+
+
+# Transient gateway failures worth retrying rather than losing a document to
+RETRY_ATTEMPTS = 3
+RETRY_ERRORS: tuple[type[httpx.HTTPError], ...] = (httpx.TransportError,)
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Uploads aren't idempotent: after a read timeout or a 502/504 the gateway may
+# already have stored the file, so only retry failures that happen before it
+# sees the request
+UPLOAD_RETRY_ERRORS: tuple[type[httpx.HTTPError], ...] = (httpx.ConnectError, httpx.ConnectTimeout)
+UPLOAD_RETRY_STATUSES = frozenset({429, 503})
+# Give up rather than wait when the gateway asks for a longer pause than this
+MAX_RETRY_AFTER = 30.0
+
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    """Parse a Retry-After header, given either as seconds or an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
 class VectorStoreClient:
     """Client for Hadrian vector store API."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, upload_cache: UploadCache | None = None):
         self.config = config
-        self.client = httpx.Client(
+        self.upload_cache = upload_cache or UploadCache()
+        # Organization's stores by name, loaded on first lookup
+        self.stores_by_name: dict[str, dict[str, Any]] | None = None
+        self.stores_lock = asyncio.Lock()
+        # Methods pass API paths relative to this, so it's only parsed once
+        self.client = httpx.AsyncClient(
+            base_url=f"{config.gateway_url.rstrip('/')}/api/v1",
             timeout=config.timeout,
+            # The transport retries failed connections; send_with_retry handles the rest
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                retries=3,
+            ),
             headers={
                 "X-API-Key": config.api_key,
             },
         )
 
-    def upload_file(self, doc: Document) -> dict[str, Any] | None:
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self.client.aclose()
+
+    async def send_with_retry(
+        self,
+        send: Callable[[], Awaitable[httpx.Response]],
+        retry_errors: tuple[type[httpx.HTTPError], ...] = RETRY_ERRORS,
+        retry_statuses: frozenset[int] = RETRY_STATUSES,
+    ) -> httpx.Response:
+        """Send a request, retrying transient failures with exponential backoff.
+
+        `send` is called once per attempt, so request bodies can be rebuilt.
+        A Retry-After header (sent with 429 and 503) is honored when longer
+        than the backoff, unless it exceeds MAX_RETRY_AFTER, in which case
+        that response is returned. The last attempt's response or error is
+        passed on.
+        """
+        delay = 0.3
+        for _ in range(RETRY_ATTEMPTS - 1):
+            try:
+                response = await send()
+            except retry_errors:
+                wait = delay
+            else:
+                if response.status_code not in retry_statuses:
+                    return response
+                retry_after = retry_after_seconds(response) or 0.0
+                if retry_after > MAX_RETRY_AFTER:
+                    return response
+                wait = max(delay, retry_after)
+
+            await asyncio.sleep(wait + random.uniform(0, wait * 0.1))
+            delay = min(delay * 2, 5.0)
+
+        return await send()
+
+    async def post_json(self, url: str, payload: dict[str, Any]) -> httpx.Response:
+        """POST a JSON body, serialized with orjson."""
+        return await self.client.post(
+            url,
+            content=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+        )
+
+    async def upload_file(self, doc: Document) -> dict[str, Any] | None:
         """Upload a file to the gateway."""
-        url = f"{self.config.gateway_url}/api/v1/files"
+        url = "/files"
 
-        with tempfile.NamedTemporaryFile(suffix=Path(doc.filename).suffix, delete=False) as f:
-            f.write(doc.content)
-            temp_path = f.name
+        data = {
+            "purpose": "assistants",
+            "owner_type": "organization",
+            "owner_id": self.config.org_id,
+        }
 
-        try:
-            with open(temp_path, "rb") as f:
+        async def send() -> httpx.Response:
+            # Reopen per attempt so a retry sends the whole file again
+            with doc.open() as f:
                 files = {"file": (doc.filename, f, doc.content_type)}
-                data = {
-                    "purpose": "assistants",
-                    "owner_type": "organization",
-                    "owner_id": self.config.org_id,
-                }
-                response = self.client.post(
+                return await self.client.post(
                     url,
                     files=files,
                     data=data,
                 )
-                response.raise_for_status()
-                return response.json()
+
+        try:
+            response = await self.send_with_retry(
+                send,
+                retry_errors=UPLOAD_RETRY_ERRORS,
+                retry_statuses=UPLOAD_RETRY_STATUSES,
+            )
+            response.raise_for_status()
+            return parse_json(response)
 
         except httpx.HTTPError as e:
             console.print(f"[red]Failed to upload {doc.filename}: {e}[/red]")
-            console.print(f"{response.text=}")
+            log_error_body(e)
             return None
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
 
-    def find_vector_store(self, name: str) -> dict[str, Any] | None:
-        """Find an existing vector store by name."""
-        url = f"{self.config.gateway_url}/api/v1/vector_stores"
+    async def list_vector_stores(self) -> dict[str, dict[str, Any]] | None:
+        """List all of the organization's vector stores, keyed by name."""
+        url = "/vector_stores"
         params = {
             "owner_type": "organization",
             "owner_id": self.config.org_id,
             "limit": 100,
         }
 
+        stores: dict[str, dict[str, Any]] = {}
         try:
-            response = self.client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            while True:
+                response = await self.client.get(url, params=params)
+                response.raise_for_status()
+                data = parse_json(response)
 
-            for store in data.get("data", []):
-                if store.get("name") == name:
-                    return store
-            return None
+                for store in data.get("data", []):
+                    # Keep the first (most recent) store when names repeat
+                    stores.setdefault(store.get("name"), store)
+
+                if not data.get("has_more") or not data.get("last_id"):
+                    return stores
+                params["after"] = data["last_id"]
 
         except httpx.HTTPError:
             return None
 
-    def get_or_create_vector_store(self, name: str, description: str) -> dict[str, Any] | None:
+    async def find_vector_store(self, name: str) -> dict[str, Any] | None:
+        """Find an existing vector store by name."""
+        # Sources run concurrently; only the first lookup should list stores
+        async with self.stores_lock:
+            if self.stores_by_name is None:
+                self.stores_by_name = await self.list_vector_stores()
+                if self.stores_by_name is None:
+                    return None
+
+        return self.stores_by_name.get(name)
+
+    async def get_or_create_vector_store(self, name: str, description: str) -> dict[str, Any] | None:
         """Get existing vector store or create a new one."""
         # First check if it already exists
-        existing = self.find_vector_store(name)
+        existing = await self.find_vector_store(name)
         if existing:
             console.print(f"  [yellow]Using existing vector store: {existing['id']}[/yellow]")
             return existing
 
         # Create new one
-        url = f"{self.config.gateway_url}/api/v1/vector_stores"
+        url = "/vector_stores"
 
         payload = {
             "owner": {
@@ -585,22 +955,25 @@ class VectorStoreClient:
             "embedding_model": self.config.embedding_model,
             "metadata": {
                 "created_by": "test-knowledge-bases.py",
-                "created_at": datetime.now().isoformat(),
+                "created_at": self.config.run_started_at,
             },
         }
 
         try:
-            response = self.client.post(url, json=payload)
+            response = await self.post_json(url, payload)
             response.raise_for_status()
-            return response.json()
+            store = parse_json(response)
+            if self.stores_by_name is not None:
+                self.stores_by_name[name] = store
+            return store
         except httpx.HTTPError as e:
             console.print(f"[red]Failed to create vector store: {e}[/red]")
-            console.print(f"{response.text=}")
+            log_error_body(e)
             return None
 
-    def add_file_to_store(self, vector_store_id: str, file_id: str) -> dict[str, Any] | None:
+    async def add_file_to_store(self, vector_store_id: str, file_id: str) -> dict[str, Any] | None:
         """Add a file to a vector store."""
-        url = f"{self.config.gateway_url}/api/v1/vector_stores/{vector_store_id}/files"
+        url = f"/vector_stores/{vector_store_id}/files"
 
         # Extract raw UUID from prefixed ID
         raw_file_id = file_id.replace("file-", "")
@@ -608,55 +981,72 @@ class VectorStoreClient:
         payload = {"file_id": raw_file_id}
 
         try:
-            response = self.client.post(url, json=payload)
+            response = await self.send_with_retry(lambda: self.post_json(url, payload))
             response.raise_for_status()
-            return response.json()
+            return parse_json(response)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 409:
                 # File already in store or other conflict - try to get existing
-                console.print(f"  [yellow]File already in store or conflict, skipping[/yellow]")
+                if self.config.verbose:
+                    console.print(f"  [yellow]File already in store or conflict, skipping[/yellow]")
                 return {"id": file_id, "status": "exists"}
             console.print(f"[red]Failed to add file to vector store: {e}[/red]")
-            console.print(f"{response.text}")
+            log_error_body(e)
             return None
         except httpx.HTTPError as e:
             console.print(f"[red]Failed to add file to vector store: {e}[/red]")
             return None
 
-    def wait_for_processing(
+    async def wait_for_processing(
         self, vector_store_id: str, file_id: str, max_wait: int = 300
     ) -> bool:
         """Wait for a file to finish processing."""
-        url = f"{self.config.gateway_url}/api/v1/vector_stores/{vector_store_id}/files/{file_id}"
-
-        start = time.time()
-        while time.time() - start < max_wait:
+        url = f"/vector_stores/{vector_store_id}/files/{file_id}"
+
+        # Poll quickly at first so small files finish promptly, then back off
+        # (with jitter, so concurrent waits don't poll in lockstep)
+        delay = 0.25
+        deadline = time.monotonic() + max_wait
+        # Validators from the last full response; if the gateway sends them,
+        # an unchanged file comes back as an empty 304
+        conditional_headers: dict[str, str] = {}
+        while time.monotonic() < deadline:
             try:
-                response = self.client.get(url)
-                response.raise_for_status()
-                data = response.json()
-
-                status = data.get("status", "")
-                if status == "completed":
-                    return True
-                elif status == "failed":
-                    error = data.get("last_error", {})
-                    console.print(f"[red]Processing failed: {error}[/red]")
-                    return False
-
-                time.sleep(2)
-
+                response = await self.client.get(url, headers=conditional_headers)
             except httpx.HTTPError as e:
                 console.print(f"[red]Failed to check status: {e}[/red]")
-                console.print(f"{response.text=}")
                 return False
 
+            # Check the status code directly rather than raising on every poll
+            if response.is_error:
+                console.print(f"[red]Failed to check status: HTTP {response.status_code}[/red]")
+                log_response_body(response)
+                return False
+
+            if response.status_code != httpx.codes.NOT_MODIFIED:
+                if etag := response.headers.get("ETag"):
+                    conditional_headers["If-None-Match"] = etag
+                if last_modified := response.headers.get("Last-Modified"):
+                    conditional_headers["If-Modified-Since"] = last_modified
+
+                data = parse_json(response)
+                match data.get("status"):
+                    case "completed":
+                        return True
+                    case "failed":
+                        error = data.get("last_error", {})
+                        console.print(f"[red]Processing failed: {error}[/red]")
+                        return False
+
+            await asyncio.sleep(delay + random.uniform(0, delay * 0.1))
+            delay = min(delay * 1.5, 5.0)
+
         console.print("[yellow]Processing timeout[/yellow]")
         return False
 
-    def search(self, vector_store_id: str, query: str, max_results: int = 5) -> dict[str, Any] | None:
+    async def search(self, vector_store_id: str, query: str, max_results: int = 5) -> dict[str, Any] | None:
         """Search a vector store."""
-        url = f"{self.config.gateway_url}/api/v1/vector_stores/{vector_store_id}/search"
+        url = f"/vector_stores/{vector_store_id}/search"
 
         payload = {
             "query": query,
@@ -664,36 +1054,43 @@ class VectorStoreClient:
         }
 
         try:
-            response = self.client.post(url, json=payload)
+            response = await self.send_with_retry(lambda: self.post_json(url, payload))
             response.raise_for_status()
-            return response.json()
+            return parse_json(response)
         except httpx.HTTPError as e:
             console.print(f"[red]Search failed: {e}[/red]")
-            console.print(f"{response.text=}")
+            log_error_body(e)
             return None
 
-    def delete_vector_store(self, vector_store_id: str) -> bool:
+    async def delete_vector_store(self, vector_store_id: str) -> bool:
         """Delete a vector store."""
-        url = f"{self.config.gateway_url}/api/v1/vector_stores/{vector_store_id}"
+        url = f"/vector_stores/{vector_store_id}"
 
         try:
-            response = self.client.delete(url)
+            response = await self.client.delete(url)
             response.raise_for_status()
+            self.upload_cache.forget_store(vector_store_id)
+            if self.stores_by_name is not None:
+                self.stores_by_name = {
+                    name: store
+                    for name, store in self.stores_by_name.items()
+                    if store.get("id") != vector_store_id
+                }
             return True
-        except httpx.HTTPError:
-            console.print(f"{response.text=}")
+        except httpx.HTTPError as e:
+            log_error_body(e)
             return False
 
-    def delete_file(self, file_id: str) -> bool:
+    async def delete_file(self, file_id: str) -> bool:
         """Delete a file."""
-        url = f"{self.config.gateway_url}/api/v1/files/{file_id}"
+        url = f"/files/{file_id}"
 
         try:
-            response = self.client.delete(url)
+            response = await self.client.delete(url)
             response.raise_for_status()
             return True
-        except httpx.HTTPError:
-            console.print(f"{response.text=}")
+        except httpx.HTTPError as e:
+            log_error_body(e)
             return False
 
 
@@ -734,48 +1131,90 @@ SAMPLE_QUERIES: dict[str, list[str]] = {
 }
 
 
-def run_source_test(
+async def run_source_test(
     source: DocumentSource,
+    http_client: httpx.AsyncClient,
     config: Config,
     vs_client: VectorStoreClient | None,
+    progress: Progress,
 ) -> tuple[FetchResult, dict[str, Any] | None]:
     """Run test for a single source."""
     console.print(f"\n[bold blue]Testing {source.name}: {source.description}[/bold blue]")
 
     # Fetch documents
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        task = progress.add_task(f"Fetching from {source.name}...", total=None)
-        http_client = create_client(config.timeout)
-        result = source.fetch(http_client, config.max_docs_per_source)
-        http_client.close()
+    task = progress.add_task(f"Fetching from {source.name}...", total=None)
+    try:
+        max_bytes = int(config.max_file_size_mb * 1024 * 1024)
+        result = await source.fetch(http_client, config.max_docs_per_source, max_bytes)
+    finally:
         progress.remove_task(task)
 
-    # Filter by file size
+    fetched_docs = list(result.documents)
+    try:
+        return result, await index_documents(source, result, config, vs_client)
+    finally:
+        # Remove any documents spooled to disk during the fetch
+        for doc in fetched_docs:
+            doc.discard()
+
+
+async def upload_document(vs_client: VectorStoreClient, store_id: str, doc: Document) -> str | None:
+    """Upload a document and add it to a store, returning its collection file ID."""
+    verbose = vs_client.config.verbose
+    if verbose:
+        console.print(f"  Uploading {doc.filename}...")
+    file_response = await vs_client.upload_file(doc)
+    # The gateway has its own copy now, so don't hold ours for the rest of the run
+    doc.discard()
+    if not file_response:
+        return None
+
+    file_id = file_response["id"]
+    if verbose:
+        console.print(f"    File uploaded: {file_id}")
+
+    add_response = await vs_client.add_file_to_store(store_id, file_id)
+    if not add_response:
+        return None
+
+    # Use the collection file ID (not the original file ID) for status checks
+    collection_file_id = add_response.get("id", file_id)
+    if verbose:
+        console.print(f"    Added to vector store: {collection_file_id}")
+    return collection_file_id
+
+
+async def index_documents(
+    source: DocumentSource,
+    result: FetchResult,
+    config: Config,
+    vs_client: VectorStoreClient | None,
+) -> dict[str, Any] | None:
+    """Upload fetched documents to a vector store and run sample searches."""
+    # Sources with large downloads drop oversized files during the fetch;
+    # anything else that slipped through is filtered in place here
     max_size_bytes = config.max_file_size_mb * 1024 * 1024
-    filtered_docs = []
-    skipped_docs = []
+    kept = 0
     for doc in result.documents:
-        if len(doc.content) <= max_size_bytes:
-            filtered_docs.append(doc)
+        if doc.size > max_size_bytes:
+            result.oversized.append((doc.title, doc.size))
+            doc.discard()
         else:
-            skipped_docs.append(doc)
-    result.documents = filtered_docs
+            result.documents[kept] = doc
+            kept += 1
+    del result.documents[kept:]
 
     # Report fetch results
-    console.print(f"  Fetched: {len(result.documents)} documents")
+    console.print(f"  Fetched from {source.name}: {len(result.documents)} documents")
     for doc in result.documents:
-        size_kb = len(doc.content) / 1024
+        size_kb = doc.size / 1024
         console.print(f"    - {doc.title[:60]}... ({size_kb:.1f} KB)")
 
-    if skipped_docs:
-        console.print(f"  [yellow]Skipped {len(skipped_docs)} files exceeding {config.max_file_size_mb} MB:[/yellow]")
-        for doc in skipped_docs:
-            size_mb = len(doc.content) / (1024 * 1024)
-            console.print(f"    [yellow]- {doc.title[:60]}... ({size_mb:.1f} MB)[/yellow]")
+    if result.oversized:
+        console.print(f"  [yellow]Skipped {len(result.oversized)} files exceeding {config.max_file_size_mb} MB:[/yellow]")
+        for title, size in result.oversized:
+            size_mb = size / (1024 * 1024)
+            console.print(f"    [yellow]- {title[:60]}... ({size_mb:.1f} MB)[/yellow]")
 
     if result.errors:
         console.print(f"  [yellow]Warnings: {len(result.errors)}[/yellow]")
@@ -783,65 +1222,179 @@ def run_source_test(
             console.print(f"    [yellow]- {error}[/yellow]")
 
     if config.dry_run or not vs_client or not result.documents:
-        return result, None
+        return None
 
     # Upload and create vector store
     console.print(f"  [cyan]Creating vector store for {source.name}...[/cyan]")
 
     store_name = f"Test: {source.description}"
-    store = vs_client.get_or_create_vector_store(store_name, f"Test knowledge base from {source.name}")
+    store = await vs_client.get_or_create_vector_store(store_name, f"Test knowledge base from {source.name}")
 
     if not store:
-        return result, None
+        return None
 
     store_id = store["id"]
     console.print(f"  Vector store created: {store_id}")
 
-    # Upload files and add to store
-    collection_file_ids = []
+    if vs_client.upload_cache.check_store(store):
+        console.print("  [yellow]Store is missing previously uploaded files, re-uploading all documents[/yellow]")
+
+    # Hash each document once; uploading discards the content
+    to_upload: list[tuple[Document, str]] = []
+    skipped = 0
     for doc in result.documents:
-        console.print(f"  Uploading {doc.filename}...")
-        file_response = vs_client.upload_file(doc)
-        if file_response:
-            file_id = file_response["id"]
-            console.print(f"    File uploaded: {file_id}")
-
-            add_response = vs_client.add_file_to_store(store_id, file_id)
-            if add_response:
-                # Use the collection file ID (not the original file ID) for status checks
-                collection_file_id = add_response.get("id", file_id)
-                collection_file_ids.append(collection_file_id)
-                console.print(f"    Added to vector store: {collection_file_id}")
-
-    # Wait for processing
+        content_hash = doc.content_hash()
+        if not config.force_upload and vs_client.upload_cache.is_current(store_id, doc.source_url, content_hash):
+            skipped += 1
+            if config.verbose:
+                console.print(f"  Skipping unchanged {doc.filename}")
+        else:
+            to_upload.append((doc, content_hash))
+
+    if skipped:
+        console.print(f"  Skipped {skipped} unchanged documents (use --force-upload to upload them anyway)")
+
+    # Each document is uploaded, added to the store and waited on in its own
+    # task, so early documents process while later ones are still uploading.
+    # Uploads are bounded to upload_concurrency at a time; the polls of a
+    # wait are sparse, so they aren't.
+    semaphore = asyncio.Semaphore(config.upload_concurrency)
+
+    async def process_document(doc: Document, content_hash: str) -> tuple[str | None, bool]:
+        async with semaphore:
+            cf_id = await upload_document(vs_client, store_id, doc)
+        if not cf_id:
+            return None, False
+        completed = await vs_client.wait_for_processing(store_id, cf_id, max_wait=120)
+        # Only a processed document is current; failures are retried next run
+        if completed:
+            vs_client.upload_cache.record(store_id, doc.source_url, content_hash)
+        return cf_id, completed
+
+    if to_upload:
+        console.print(f"  [cyan]Uploading and processing {len(to_upload)} {source.name} documents...[/cyan]")
+    processed = await asyncio.gather(*(process_document(doc, content_hash) for doc, content_hash in to_upload))
+    collection_file_ids = [cf_id for cf_id, _ in processed if cf_id]
+    statuses = [success for cf_id, success in processed if cf_id]
+
     if collection_file_ids:
-        console.print("  [cyan]Waiting for processing...[/cyan]")
-        for cf_id in collection_file_ids:
-            success = vs_client.wait_for_processing(store_id, cf_id, max_wait=120)
-            if success:
-                console.print(f"    {cf_id}: [green]completed[/green]")
-            else:
-                console.print(f"    {cf_id}: [red]failed[/red]")
+        if config.verbose:
+            for cf_id, success in zip(collection_file_ids, statuses):
+                if success:
+                    console.print(f"    {cf_id}: [green]completed[/green]")
+                else:
+                    console.print(f"    {cf_id}: [red]failed[/red]")
+        else:
+            completed = sum(statuses)
+            console.print(f"    {completed}/{len(statuses)} files [green]completed[/green]")
 
     # Run sample searches
     queries = SAMPLE_QUERIES.get(source.name, ["test query"])
-    console.print("  [cyan]Running sample searches...[/cyan]")
+    console.print(f"  [cyan]Running {source.name} sample searches...[/cyan]")
+
+    queries = queries[:2]
+    responses = await asyncio.gather(
+        *(vs_client.search(store_id, query, max_results=3) for query in queries)
+    )
 
     search_results = {}
-    for query in queries[:2]:
-        results = vs_client.search(store_id, query, max_results=3)
+    for query, results in zip(queries, responses):
         if results:
             hits = len(results.get("data", []))
             console.print(f"    Query '{query[:30]}...': {hits} results")
             search_results[query] = results
 
-    return result, {
+    return {
         "store_id": store_id,
         "file_ids": collection_file_ids,
         "search_results": search_results,
     }
 
 
+async def run_tests(sources: list[DocumentSource], config: Config, cleanup: bool) -> None:
+    """Run tests for all sources concurrently, then summarize and optionally clean up."""
+    # Initialize vector store client if not dry run
+    vs_client = None if config.dry_run else VectorStoreClient(config)
+
+    async def run_source(source: DocumentSource) -> tuple[FetchResult, dict[str, Any] | None] | None:
+        try:
+            return await run_source_test(source, http_client, config, vs_client, progress)
+        except Exception as e:
+            console.print(f"[red]Error testing {source.name}: {e}[/red]")
+            import traceback
+            traceback.print_exc()
+            return None
+
+    try:
+        # Sources are independent, so run them all at once. Their output
+        # interleaves; fetch spinners share a single progress display.
+        async with create_client(config.timeout) as http_client:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=console,
+            ) as progress:
+                results = await asyncio.gather(*(run_source(source) for source in sources))
+
+        all_results = [result for result in results if result is not None]
+        print_summary(all_results)
+
+        if cleanup and vs_client:
+            await cleanup_results(vs_client, all_results)
+
+        if vs_client:
+            vs_client.upload_cache.save()
+
+    finally:
+        if vs_client:
+            await vs_client.aclose()
+
+
+def print_summary(all_results: list[tuple[FetchResult, dict[str, Any] | None]]) -> None:
+    """Print a table of per-source results."""
+    console.print("\n[bold]Summary[/bold]")
+    table = Table()
+    table.add_column("Source")
+    table.add_column("Documents")
+    table.add_column("Errors")
+    table.add_column("Vector Store")
+
+    for fetch_result, store_info in all_results:
+        store_id = store_info["store_id"] if store_info else "-"
+        table.add_row(
+            fetch_result.source_name,
+            str(len(fetch_result.documents)),
+            str(len(fetch_result.errors)),
+            store_id[:20] + "..." if len(store_id) > 20 else store_id,
+        )
+
+    console.print(table)
+
+
+async def cleanup_results(
+    vs_client: VectorStoreClient,
+    all_results: list[tuple[FetchResult, dict[str, Any] | None]],
+) -> None:
+    """Delete the vector stores and files created by a run."""
+    console.print("\n[cyan]Cleaning up...[/cyan]")
+
+    async def delete_store(store_info: dict[str, Any]) -> None:
+        # The store and its files are independent deletes, so issue them together
+        file_ids = store_info.get("file_ids", [])
+        store_deleted, *files_deleted = await asyncio.gather(
+            vs_client.delete_vector_store(store_info["store_id"]),
+            *(vs_client.delete_file(file_id) for file_id in file_ids),
+        )
+        if store_deleted:
+            console.print(f"  Deleted vector store: {store_info['store_id']}")
+        if vs_client.config.verbose:
+            for file_id, deleted in zip(file_ids, files_deleted):
+                if deleted:
+                    console.print(f"  Deleted file: {file_id}")
+
+    await asyncio.gather(*(delete_store(store_info) for _, store_info in all_results if store_info))
+
+
 def list_sources():
     """List available sources."""
     table = Table(title="Available Document Sources")
@@ -855,6 +1408,8 @@ def list_sources():
 
 
 def main():
+    env_config = Config.from_env()
+
     parser = argparse.ArgumentParser(
         description="Test Knowledge Bases with documents from public sources"
     )
@@ -866,17 +1421,17 @@ def main():
     )
     parser.add_argument(
         "--gateway-url",
-        default=os.environ.get("GATEWAY_URL", "http://localhost:8080"),
+        default=env_config.gateway_url,
         help="Gateway URL (default: http://localhost:8080)",
     )
     parser.add_argument(
         "--api-key",
-        default=os.environ.get("HADRIAN_API_KEY", "test-key"),
+        default=env_config.api_key,
         help="API key for authentication",
     )
     parser.add_argument(
         "--org-id",
-        default=os.environ.get("HADRIAN_ORG_ID", "00000000-0000-0000-0000-000000000001"),
+        default=env_config.org_id,
         help="Organization ID for ownership",
     )
     parser.add_argument(
@@ -905,15 +1460,51 @@ def main():
         default="text-embedding-3-small",
         help="Embedding model to use (default: text-embedding-3-small)",
     )
+    parser.add_argument(
+        "--force-upload",
+        action="store_true",
+        help="Upload documents even if unchanged since the last run",
+    )
+    parser.add_argument(
+        "--upload-concurrency",
+        type=int,
+        default=8,
+        help="Maximum documents uploaded to the gateway at once (default: 8)",
+    )
     parser.add_argument(
         "--max-file-size",
         type=float,
         default=10.0,
         help="Maximum file size in MB (default: 10)",
     )
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Report every upload, processing status and deletion",
+    )
+    output.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Suppress all console output",
+    )
+    parser.add_argument(
+        "--log-file",
+        type=Path,
+        help="Write failed response bodies to this file instead of the console",
+    )
 
     args = parser.parse_args()
 
+    console.quiet = args.quiet
+    logging.basicConfig(
+        format="%(asctime)s %(levelname)s %(message)s" if args.log_file else "%(message)s",
+        handlers=[
+            logging.FileHandler(args.log_file) if args.log_file
+            else RichHandler(console=console, show_path=False)
+        ],
+    )
+
     if args.list_sources:
         list_sources()
         return
@@ -926,6 +1517,9 @@ def main():
         max_docs_per_source=args.max_docs,
         embedding_model=args.embedding_model,
         max_file_size_mb=args.max_file_size,
+        force_upload=args.force_upload,
+        upload_concurrency=args.upload_concurrency,
+        verbose=args.verbose,
     )
 
     console.print("[bold]Knowledge Base Test Script[/bold]")
@@ -934,9 +1528,6 @@ def main():
     console.print(f"Max docs per source: {config.max_docs_per_source}")
     console.print(f"Max file size: {config.max_file_size_mb} MB")
 
-    # Initialize vector store client if not dry run
-    vs_client = None if config.dry_run else VectorStoreClient(config)
-
     # Determine which sources to test
     if args.source == "all":
         sources_to_test = list(SOURCES.values())
@@ -944,47 +1535,7 @@ def main():
         sources_to_test = [SOURCES[args.source]]
 
     # Run tests
-    all_results: list[tuple[FetchResult, dict[str, Any] | None]] = []
-    for source in sources_to_test:
-        try:
-            result = run_source_test(source, config, vs_client)
-            all_results.append(result)
-        except Exception as e:
-            console.print(f"[red]Error testing {source.name}: {e}[/red]")
-            import traceback
-            traceback.print_exc()
-
-    # Summary
-    console.print("\n[bold]Summary[/bold]")
-    table = Table()
-    table.add_column("Source")
-    table.add_column("Documents")
-    table.add_column("Errors")
-    table.add_column("Vector Store")
-
-    for fetch_result, store_info in all_results:
-        store_id = store_info["store_id"] if store_info else "-"
-        table.add_row(
-            fetch_result.source_name,
-            str(len(fetch_result.documents)),
-            str(len(fetch_result.errors)),
-            store_id[:20] + "..." if len(store_id) > 20 else store_id,
-        )
-
-    console.print(table)
-
-    # Cleanup if requested
-    if args.cleanup and vs_client:
-        console.print("\n[cyan]Cleaning up...[/cyan]")
-        for _, store_info in all_results:
-            if store_info:
-                # Delete vector store
-                if vs_client.delete_vector_store(store_info["store_id"]):
-                    console.print(f"  Deleted vector store: {store_info['store_id']}")
-                # Delete files
-                for file_id in store_info.get("file_ids", []):
-                    if vs_client.delete_file(file_id):
-                        console.print(f"  Deleted file: {file_id}")
+    asyncio.run(run_tests(sources_to_test, config, cleanup=args.cleanup))
 
     console.print("\n[green]Done![/green]")
 
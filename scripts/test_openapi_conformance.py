@@ -23,6 +23,7 @@ Or via pytest if pyyaml/pytest are already on PYTHONPATH:
 
 from __future__ import annotations
 
+import copy
 import importlib.util
 import sys
 from pathlib import Path
@@ -44,6 +45,7 @@ OpenAPIResolver = _module.OpenAPIResolver
 ConformanceChecker = _module.ConformanceChecker
 DiffType = _module.DiffType
 EXTENSION_MARKER = _module.EXTENSION_MARKER
+DOCUMENTED_MISSING_FIELDS = _module.DOCUMENTED_MISSING_FIELDS
 
 
 # ---------------------------------------------------------------------------
@@ -147,6 +149,43 @@ def test_resolve_schema_allof_overlapping_required_not_duplicated():
     assert resolved["required"] == ["x"]
 
 
+def test_resolve_schema_allof_required_keeps_declaration_order():
+    spec: dict = {"components": {"schemas": {}}}
+    resolver = OpenAPIResolver(spec)
+    resolved = resolver.resolve_schema(
+        {
+            "allOf": [
+                {"properties": {"b": {}, "a": {}}, "required": ["b", "a"]},
+                {"properties": {"c": {}, "a": {}}, "required": ["c", "a"]},
+            ]
+        }
+    )
+    assert resolved["required"] == ["b", "a", "c"]
+    assert resolved["_required_set"] == frozenset({"a", "b", "c"})
+
+
+def test_resolve_schema_allof_reuses_shared_component_resolution():
+    spec = {
+        "components": {
+            "schemas": {
+                "Base": {
+                    "type": "object",
+                    "properties": {"x": {"$ref": "#/components/schemas/X"}},
+                },
+                "X": {"type": "object", "properties": {"y": {"type": "string"}}},
+                "A": {"allOf": [{"$ref": "#/components/schemas/Base"}]},
+                "B": {"allOf": [{"$ref": "#/components/schemas/Base"}]},
+            }
+        }
+    }
+    resolver = OpenAPIResolver(spec)
+    a = resolver.resolve_ref("#/components/schemas/A")
+    b = resolver.resolve_ref("#/components/schemas/B")
+    assert a["properties"]["x"]["properties"]["y"] == {"type": "string"}
+    # Base's properties are resolved once and shared by both merges
+    assert a["properties"]["x"] is b["properties"]["x"]
+
+
 # ---------------------------------------------------------------------------
 # OpenAPIResolver.resolve_schema — oneOf / anyOf
 # ---------------------------------------------------------------------------
@@ -338,6 +377,125 @@ def test_conformance_passes_for_matching_endpoint():
     assert missing_endpoint_violations == []
 
 
+def test_conformance_reports_documented_fields_that_are_no_longer_missing():
+    def completions_spec(properties):
+        return _minimal_spec(
+            {
+                "/completions": {
+                    "post": {
+                        "requestBody": {
+                            "content": {
+                                "application/json": {
+                                    "schema": {"type": "object", "properties": properties}
+                                }
+                            }
+                        },
+                    }
+                }
+            }
+        )
+
+    # OpenAI still has include_usage (documented as missing) and
+    # include_obfuscation, but Hadrian now implements include_obfuscation.
+    openai_spec = completions_spec(
+        {"include_usage": {"type": "boolean"}, "include_obfuscation": {"type": "boolean"}}
+    )
+    hadrian_spec = completions_spec({"include_obfuscation": {"type": "boolean"}})
+    hadrian_spec["paths"] = {"/api/v1/completions": hadrian_spec["paths"].pop("/completions")}
+
+    checker = ConformanceChecker(openai_spec, hadrian_spec)
+    stale = checker.check_conformance().stale_documented_fields
+    assert ("/completions", "POST", "request", "include_obfuscation") in stale
+    assert ("/completions", "POST", "request", "include_usage") not in stale
+
+    # Filtered runs skip most of the table, so nothing is reported as stale
+    filtered = ConformanceChecker(openai_spec, hadrian_spec).check_conformance("/completions")
+    assert filtered.stale_documented_fields == []
+
+
+def test_conformance_does_not_mutate_input_specs():
+    # The resolver and checker cache results by id() of spec nodes, which
+    # is only sound while the specs stay untouched.
+    def spec(paths_prefix, extra_field):
+        components = {
+            "Base": {
+                "type": "object",
+                "properties": {"id": {"type": "string"}},
+                "required": ["id"],
+            },
+            "Tool": {
+                "oneOf": [
+                    {"type": "object", "properties": {"type": {"enum": ["a"]}}},
+                    {"type": "object", "properties": {"type": {"const": "b"}}},
+                ]
+            },
+            "Request": {
+                "allOf": [
+                    {"$ref": "#/components/schemas/Base"},
+                    {
+                        "type": "object",
+                        "properties": {
+                            "tools": {"type": "array", "items": {"$ref": "#/components/schemas/Tool"}},
+                            extra_field: {"type": "integer"},
+                        },
+                        "required": ["tools"],
+                    },
+                ]
+            },
+        }
+        return {
+            "info": {"version": "1.0.0", "title": "test"},
+            "paths": {
+                f"{paths_prefix}/responses": {
+                    "post": {
+                        "requestBody": {
+                            "content": {
+                                "application/json": {
+                                    "schema": {"$ref": "#/components/schemas/Request"}
+                                }
+                            }
+                        },
+                        "parameters": [{"name": "q", "in": "query", "schema": {"type": "string"}}],
+                    }
+                }
+            },
+            "components": {"schemas": components},
+        }
+
+    openai_spec = spec("", "openai_only")
+    hadrian_spec = spec("/api/v1", "hadrian_only")
+    openai_before = copy.deepcopy(openai_spec)
+    hadrian_before = copy.deepcopy(hadrian_spec)
+
+    ConformanceChecker(openai_spec, hadrian_spec).check_conformance()
+
+    assert openai_spec == openai_before
+    assert hadrian_spec == hadrian_before
+
+
+# ---------------------------------------------------------------------------
+# DOCUMENTED_MISSING_FIELDS lookup
+# ---------------------------------------------------------------------------
+
+
+def test_documented_missing_reason_matches_table():
+    for (path, method, location, field), reason in DOCUMENTED_MISSING_FIELDS.items():
+        assert _module._documented_missing_reason(path, method, location, field) == reason
+
+
+def test_documented_missing_reason_unknown_field_returns_none():
+    assert _module._documented_missing_reason("/chat/completions", "POST", "request", "messages") is None
+    assert _module._documented_missing_reason("/not/a/path", "GET", "param", "order") is None
+
+
+def test_documented_missing_keys_use_known_methods_and_locations():
+    # Lookups compare these as plain strings, so a lowercase method or a
+    # misspelled location would never match and the entry would be dead.
+    for path, method, location, field in DOCUMENTED_MISSING_FIELDS:
+        assert method in {"GET", "POST", "PUT", "PATCH", "DELETE"}, (path, method, field)
+        assert location in {"request", "response", "param"}, (path, location, field)
+
+
 def test_extension_marker_constant_is_stable():
     # Tests asserting against extension docs use this marker; if it changes,
     # callers must update too.